@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""Micro-benchmarks of the functions in sunburst.calc and sunburst.path.
+
+Run from the root of the repository, e.g.
+
+    python3 benchmarks/bench_calc.py --sizes 1000 100000 -o before.json
+    # ... change something ...
+    python3 benchmarks/bench_calc.py --sizes 1000 100000 -c before.json
+
+See ``--help`` for all options.
+"""
+
+import argparse
+import collections
+import sys
+from typing import Any, Callable, Dict, List, cast
+from sunburst.calc import (
+    calculate_angles,
+    complete_paths,
+    complete_pv,
+    structure_paths,
+)
+from sunburst.path import Path, charvalues_to_pv, stringvalues_to_pv
+from sunburst.tree import PathTree
+import harness
+import trees
+
+Data = collections.namedtuple(
+    "Data",
+    ["pathvalues", "completed", "structured", "tuples", "strings", "chars"],
+)
+Data.__doc__ = """Inputs of the benchmarks for one tree."""
+
+
+def prepare(pathvalues: Dict[Path, float]) -> Data:
+    completed = cast(Dict[Path, float], complete_pv(pathvalues, vectorized=True))
+    structured = structure_paths(list(completed))
+    return Data(
+        pathvalues=pathvalues,
+        completed=completed,
+        structured=structured,
+        tuples=[tuple(path) for path in completed],
+        strings=trees.to_stringvalues(pathvalues),
+        chars=trees.to_charvalues(pathvalues),
+    )
+
+
+#: Benchmark name: function of the prepared data that returns the function
+#: to time
+BENCHMARKS = collections.OrderedDict(
+    [
+        ("complete_pv", lambda d: lambda: complete_pv(d.pathvalues)),
+        (
+            "complete_pv_vectorized",
+            lambda d: lambda: complete_pv(d.pathvalues, vectorized=True),
+        ),
+        ("PathTree.from_pv", lambda d: lambda: PathTree.from_pv(d.pathvalues)),
+        ("complete_paths", lambda d: lambda: complete_paths(list(d.pathvalues))),
+        (
+            "structure_paths",
+            lambda d: lambda: structure_paths(list(d.completed)),
+        ),
+        (
+            "calculate_angles",
+            lambda d: lambda: calculate_angles(d.structured, d.completed),
+        ),
+        ("Path", lambda d: lambda: [Path(path) for path in d.tuples]),
+        (
+            "Path.__getitem__",
+            lambda d: lambda: [(path[:-1], path[-1:]) for path in d.completed],
+        ),
+        ("stringvalues_to_pv", lambda d: lambda: stringvalues_to_pv(d.strings)),
+        ("charvalues_to_pv", lambda d: lambda: charvalues_to_pv(d.chars)),
+    ]
+)  # type: Dict[str, Callable[[Data], Callable[[], object]]]
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmarks of sunburst.calc and sunburst.path"
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="Numbers of nodes of the generated trees (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-b",
+        "--benchmarks",
+        nargs="+",
+        metavar="PATTERN",
+        help="Only run the benchmarks whose names contain one of these "
+        "strings, available: " + ", ".join(BENCHMARKS),
+    )
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--fan-out", type=float, default=8)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of timing loops (default: %(default)s)",
+    )
+    harness.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    names = harness.select(list(BENCHMARKS), args.benchmarks)
+    results = {}  # type: Dict[str, Dict]
+    for size in args.sizes:
+        data = prepare(
+            trees.generate_tree(
+                size, args.depth, args.fan_out, args.skew, args.seed
+            )
+        )
+        for name in names:
+            key = "{}[{}]".format(name, size)
+            timing = harness.time_function(BENCHMARKS[name](data), args.repeat)
+            result = {"benchmark": name, "size": size}  # type: Dict[str, Any]
+            result.update(timing)
+            results[key] = result
+            print(
+                "{:<45} {:>10.3f} ms (median {:.3f} ms)".format(
+                    key, 1000 * result["min"], 1000 * result["median"]
+                )
+            )
+    meta = harness.metadata(
+        sizes=args.sizes,
+        depth=args.depth,
+        fan_out=args.fan_out,
+        skew=args.skew,
+        seed=args.seed,
+    )
+    return harness.finish(args, meta, results, ["min"])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+"""End-to-end benchmark of plotting a sunburst chart and saving it with the
+Agg backend: the time and memory usage of preparing the data, plotting and
+saving, and the wall time and ``tracemalloc`` peak of every stage recorded
+by ``SunburstPlot(stats=True)``.
+
+Run from the root of the repository, e.g.
+
+    python3 benchmarks/bench_render.py -o before.json
+    # ... upgrade something ...
+    python3 benchmarks/bench_render.py -c before.json
+
+See ``--help`` for all options.
+"""
+
+import argparse
+import collections
+import io
+import multiprocessing
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+import matplotlib
+
+matplotlib.use("Agg")
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+import sunburst  # noqa: E402
+from sunburst.io import read_tree  # noqa: E402
+from sunburst.path import Path  # noqa: E402
+from sunburst.plot import SunburstPlot  # noqa: E402
+import harness  # noqa: E402
+import trees  # noqa: E402
+
+#: Steps that are measured separately: SunburstPlot.prepare_data (including
+#: the creation of the wedges), SunburstPlot.plot (adding the wedges and the
+#: annotations to the axes) and saving (drawing) the figure. The stages
+#: within the steps are measured by SunburstPlot.stats.
+STEPS = ["prepare_data", "plot", "savefig"]
+
+#: Metrics: wall time in seconds, peak resident set size of the process
+#: after the step and peak of the memory allocated by Python during the
+#: step or stage (both in bytes, the peak RSS only for the STEPS)
+METRICS = ["time", "peak_rss", "tracemalloc_peak"]
+
+FILE_SIZES = sunburst.base_dir / "examples" / "data" / "file_sizes.txt"
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else 1024 * peak
+
+
+def run_dataset(
+    pathvalues: Dict[Path, float],
+    trace: bool,
+    stats: bool,
+    image_format: str,
+    plot_kwargs: Dict,
+    render: str,
+) -> Dict[str, Dict[str, float]]:
+    """Plots a chart of `pathvalues` and saves it. Meant to run in a fresh
+    process, so that the peak RSS is not influenced by other datasets.
+
+    Args:
+        pathvalues: Data to plot
+        trace: Measure the memory allocations with :mod:`tracemalloc`
+            (instead of the wall time, which is distorted by the tracing)
+        stats: Collect :py:attr:`sunburst.plot.SunburstPlot.stats`. When
+            tracing, only the stages are returned then, because the
+            stats reset the peak of the traced memory in every stage.
+        image_format: Format of the saved figure
+        plot_kwargs: Keyword arguments of the
+            :class:`~sunburst.plot.SunburstPlot`
+        render: See :py:meth:`sunburst.plot.SunburstPlot.plot`
+
+    Returns:
+        Metrics of the :py:data:`STEPS` and/or of the stages recorded by
+        :py:attr:`sunburst.plot.SunburstPlot.stats`
+    """
+    figure = Figure(figsize=(10, 10))
+    FigureCanvasAgg(figure)
+    sbp = SunburstPlot(
+        pathvalues, figure.add_subplot(), stats=stats, **plot_kwargs
+    )
+    steps = collections.OrderedDict(
+        [
+            ("prepare_data", sbp.prepare_data),
+            ("plot", lambda: sbp.plot(setup_axes=True, render=render)),
+            (
+                "savefig",
+                lambda: figure.savefig(io.BytesIO(), format=image_format),
+            ),
+        ]
+    )  # type: Dict[str, Callable[[], None]]
+    results = collections.OrderedDict()  # type: Dict[str, Dict[str, float]]
+    if trace:
+        tracemalloc.start()
+    for step, function in steps.items():
+        if trace:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else:
+                # Python < 3.9: restart to reset the peak
+                tracemalloc.stop()
+                tracemalloc.start()
+                start_memory = 0
+            function()
+            results[step] = {
+                "tracemalloc_peak": tracemalloc.get_traced_memory()[1]
+                - start_memory
+            }
+        else:
+            start = time.perf_counter()
+            function()
+            results[step] = {
+                "time": time.perf_counter() - start,
+                "peak_rss": peak_rss(),
+            }
+    if trace:
+        tracemalloc.stop()
+        if not stats:
+            return results
+        return collections.OrderedDict(
+            (stage, {"tracemalloc_peak": peak})
+            for stage, peak in sbp.stats.memory.items()
+        )
+    stages = collections.OrderedDict(
+        (stage, {"time": duration})
+        for stage, duration in sbp.stats.durations.items()
+    )
+    stages.update(results)
+    return stages
+
+
+def in_process(function: Callable, *args):
+    """Calls `function` with `args` in a new process and returns the
+    result.
+    """
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(function, args)
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark of plotting and saving sunburst charts"
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000],
+        help="Numbers of nodes of the generated trees, besides the file "
+        "sizes example (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-d",
+        "--datasets",
+        nargs="+",
+        metavar="PATTERN",
+        help="Only run the datasets whose names contain one of these "
+        "strings, e.g. 'file_sizes' or 'tree[10000]'",
+    )
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--fan-out", type=float, default=8)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of timed runs of every dataset, the fastest counts "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--render",
+        choices=["patches", "collection"],
+        default="patches",
+        help="See SunburstPlot.plot (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--format",
+        default="png",
+        help="Format of the saved figure (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--minimal-angle",
+        type=float,
+        default=0,
+        help="plot_minimal_angle and label_minimal_angle of the plot "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cull-labels",
+        action="store_true",
+        help="Use SunburstPlot(cull_labels=True)",
+    )
+    parser.add_argument(
+        "--no-tracemalloc",
+        action="store_true",
+        help="Skip the (slow) runs that trace the memory allocations",
+    )
+    harness.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    datasets = collections.OrderedDict()  # type: Dict[str, Callable]
+    datasets["file_sizes"] = lambda: read_tree(FILE_SIZES)
+    for size in args.sizes:
+        datasets["tree[{}]".format(size)] = lambda size=size: (
+            trees.generate_tree(
+                size, args.depth, args.fan_out, args.skew, args.seed
+            )
+        )
+    plot_kwargs = {
+        "plot_minimal_angle": args.minimal_angle,
+        "label_minimal_angle": args.minimal_angle,
+        "cull_labels": args.cull_labels,
+    }
+
+    results = {}  # type: Dict[str, Dict]
+    print(
+        "{:<30} {:>10} {:>12} {:>17}".format(
+            "stage", "time [s]", "peak RSS", "tracemalloc peak"
+        )
+    )
+    for name in harness.select(list(datasets), args.datasets):
+        pathvalues = datasets[name]()
+        runs = [
+            in_process(
+                run_dataset,
+                pathvalues,
+                False,
+                True,
+                args.format,
+                plot_kwargs,
+                args.render,
+            )
+            for _ in range(args.repeat)
+        ]
+        traced = {}  # type: Dict[str, Dict[str, float]]
+        if not args.no_tracemalloc:
+            # the steps and the stages need separate runs, see run_dataset
+            for stats in (False, True):
+                traced.update(
+                    in_process(
+                        run_dataset,
+                        pathvalues,
+                        True,
+                        stats,
+                        args.format,
+                        plot_kwargs,
+                        args.render,
+                    )
+                )
+        for stage in runs[0]:
+            result = {
+                metric: min(run[stage][metric] for run in runs)
+                for metric in runs[0][stage]
+            }  # type: Dict
+            result.update(traced.get(stage, {}))
+            result.update(dataset=name, stage=stage, n_paths=len(pathvalues))
+            key = "{}/{}".format(name, stage)
+            results[key] = result
+            print(
+                "{:<30} {:>10.3f} {:>12} {:>17}".format(
+                    key,
+                    result["time"],
+                    (
+                        "{:.1f} MB".format(result["peak_rss"] / 2**20)
+                        if "peak_rss" in result
+                        else "-"
+                    ),
+                    (
+                        "{:.1f} MB".format(result["tracemalloc_peak"] / 2**20)
+                        if "tracemalloc_peak" in result
+                        else "-"
+                    ),
+                )
+            )
+    meta = harness.metadata(
+        sizes=args.sizes,
+        depth=args.depth,
+        fan_out=args.fan_out,
+        skew=args.skew,
+        seed=args.seed,
+        render=args.render,
+        format=args.format,
+        **plot_kwargs,
+    )
+    # stages that take a few milliseconds vary a lot between runs
+    return harness.finish(args, meta, results, METRICS, {"time": 0.005})
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
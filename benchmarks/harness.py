@@ -0,0 +1,199 @@
+"""Timing, storing and comparing benchmark results"""
+
+import datetime
+import json
+import platform
+import sys
+import timeit
+from typing import Callable, Dict, List, Optional
+import matplotlib
+import numpy as np
+import sunburst
+
+#: Format version of the result files
+RESULTS_VERSION = 1
+
+
+def time_function(
+    function: Callable[[], object], repeat: int = 5, min_time: float = 0.2
+) -> Dict[str, float]:
+    """Times `function` like :mod:`timeit`: the function is called in
+    loops that take at least `min_time` seconds (at least once), `repeat`
+    times.
+
+    Returns:
+        Minimum and median duration of one call in seconds, the number of
+        calls per loop and the number of loops
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        duration = timer.timeit(number)
+        if duration >= min_time:
+            break
+        number *= 10 if duration < min_time / 10 else 2
+    times = [duration]
+    if repeat > 1:
+        times += timer.repeat(repeat - 1, number)
+    per_call = sorted(time / number for time in times)
+    return {
+        "min": per_call[0],
+        "median": per_call[len(per_call) // 2],
+        "number": number,
+        "repeat": len(times),
+    }
+
+
+def metadata(**parameters) -> Dict:
+    """Describes the environment of a benchmark run, together with the
+    `parameters` of the run.
+    """
+    return {
+        "version": RESULTS_VERSION,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "sunburst": (sunburst.base_dir / "version.txt").read_text().strip(),
+        "parameters": parameters,
+    }
+
+
+def save_results(file_name: str, meta: Dict, results: Dict[str, Dict]) -> None:
+    """Writes the results (by benchmark name) of a run as JSON."""
+    with open(file_name, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+        f.write("\n")
+
+
+def load_results(file_name: str) -> Dict[str, Dict]:
+    """Returns the results (by benchmark name) of a file written by
+    :func:`save_results`.
+    """
+    with open(file_name) as f:
+        content = json.load(f)
+    if content.get("meta", {}).get("version") != RESULTS_VERSION:
+        raise ValueError("{} is not a result file.".format(file_name))
+    return content["results"]
+
+
+def compare_results(
+    baseline: Dict[str, Dict],
+    results: Dict[str, Dict],
+    tolerance: float,
+    metrics: List[str],
+    noise: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """Prints a table of the ratios between the `metrics` of `results` and
+    `baseline` (for the benchmarks that are part of both).
+
+    Args:
+        baseline: Results of the reference run
+        results: Results of the current run
+        tolerance: Allowed relative increase of a metric, e.g. 0.2 for 20%
+        metrics: Keys of the results to compare (smaller is better)
+        noise: By metric: differences below this absolute value are not
+            counted as regressions (e.g. for very short stages)
+
+    Returns:
+        "<benchmark> <metric>" for every regression beyond the tolerance
+    """
+    regressions = []
+    print(
+        "{:<45} {:<16} {:>12} {:>12} {:>7}".format(
+            "benchmark", "metric", "baseline", "current", "ratio"
+        )
+    )
+    for name in results:
+        if name not in baseline:
+            continue
+        for metric in metrics:
+            old = baseline[name].get(metric)
+            new = results[name].get(metric)
+            if old is None or new is None:
+                continue
+            ratio = new / old if old else float("inf") if new else 1.0
+            if (noise or {}).get(metric, 0) > abs(new - old):
+                flag = ""
+            elif ratio > 1 + tolerance:
+                flag = "  slower"
+                regressions.append("{} {}".format(name, metric))
+            elif ratio < 1 / (1 + tolerance):
+                flag = "  faster"
+            else:
+                flag = ""
+            print(
+                "{:<45} {:<16} {:>12.4g} {:>12.4g} {:>7.2f}{}".format(
+                    name, metric, old, new, ratio, flag
+                )
+            )
+    return regressions
+
+
+def finish(
+    args,
+    meta: Dict,
+    results: Dict[str, Dict],
+    metrics: List[str],
+    noise: Optional[Dict[str, float]] = None,
+) -> int:
+    """Saves the results and compares them to the baseline, as requested by
+    the command line arguments `args` (see :func:`add_arguments`, `noise`
+    see :func:`compare_results`).
+
+    Returns:
+        Exit code: 1 if there was a regression, otherwise 0
+    """
+    if args.output:
+        save_results(args.output, meta, results)
+        print("Results written to {}".format(args.output))
+    if not args.compare:
+        return 0
+    regressions = compare_results(
+        load_results(args.compare), results, args.tolerance, metrics, noise
+    )
+    if regressions:
+        print(
+            "{} regression(s) beyond a tolerance of {:.0%}:".format(
+                len(regressions), args.tolerance
+            ),
+            file=sys.stderr,
+        )
+        for regression in regressions:
+            print("    " + regression, file=sys.stderr)
+        return 1
+    return 0
+
+
+def add_arguments(parser, default_tolerance: float = 0.2) -> None:
+    """Adds the arguments common to all benchmark scripts to an
+    :class:`argparse.ArgumentParser`.
+    """
+    parser.add_argument(
+        "-o", "--output", help="Write the results to this JSON file"
+    )
+    parser.add_argument(
+        "-c",
+        "--compare",
+        metavar="BASELINE",
+        help="Compare the results to this JSON file (written with --output"
+        " before) and exit with code 1 if anything got slower than the "
+        "tolerance",
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=default_tolerance,
+        help="Allowed relative slowdown (default: %(default)s)",
+    )
+
+
+def select(names: List[str], patterns: Optional[List[str]]) -> List[str]:
+    """Returns the names that contain any of the patterns (all names if
+    there are no patterns).
+    """
+    if not patterns:
+        return names
+    return [name for name in names if any(p in name for p in patterns)]
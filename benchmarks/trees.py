@@ -0,0 +1,103 @@
+"""Synthetic pathvalues for the benchmarks"""
+
+import string
+from typing import Dict, List
+import numpy as np
+from sunburst.path import Path
+
+
+def generate_tree(
+    n_nodes: int,
+    depth: int = 6,
+    fan_out: float = 8,
+    skew: float = 1.0,
+    seed: int = 0,
+) -> Dict[Path, float]:
+    """Generates the pathvalues of a random tree with `n_nodes` nodes (not
+    counting the root). Only the leaves have values (file sizes drawn from a
+    log-normal distribution), so all inner nodes are implied ancestors, like
+    in a list of files.
+
+    The tree is built level by level: every level has `fan_out` times as
+    many nodes as the one before (the deepest level takes all remaining
+    nodes). The parents of the nodes of a level are drawn from the nodes of
+    the level before with probabilities following Zipf's law with exponent
+    `skew`: 0 gives subtrees of similar sizes, larger values give a few
+    huge subtrees and many small ones.
+
+    Args:
+        n_nodes: Number of nodes
+        depth: Maximal length of the paths
+        fan_out: Average number of children of the inner nodes
+        skew: Exponent of the distribution of the children among the nodes
+            of the level above
+        seed: Seed of the random number generator
+
+    Returns:
+        Pathvalues of the leaves, in breadth first order
+    """
+    if n_nodes < 1:
+        raise ValueError("The tree needs at least one node.")
+    rng = np.random.default_rng(seed)
+    # parents of the nodes of each level, as index into the level above
+    level_parents = []  # type: List[np.ndarray]
+    size = 1
+    remaining = n_nodes
+    for level in range(1, depth + 1):
+        if level == depth:
+            size = remaining
+        else:
+            size = min(remaining, max(1, int(round(size * fan_out))))
+        if not size:
+            break
+        n_parents = 1 if level == 1 else len(level_parents[-1])
+        weights = 1 / np.arange(1, n_parents + 1) ** skew
+        weights = rng.permutation(weights / weights.sum())
+        level_parents.append(
+            np.sort(rng.choice(n_parents, size=size, p=weights))
+        )
+        remaining -= size
+
+    values = {}  # type: Dict[Path, float]
+    parent_paths = [Path(())]
+    for parents in level_parents:
+        has_children = np.zeros(len(parent_paths), dtype=bool)
+        has_children[parents] = True
+        for index in np.flatnonzero(~has_children).tolist():
+            values[parent_paths[index]] = 0.0
+        paths = []
+        previous_parent = -1
+        child_no = 0
+        for parent in parents.tolist():
+            child_no = child_no + 1 if parent == previous_parent else 0
+            previous_parent = parent
+            paths.append(
+                tuple.__new__(
+                    Path, parent_paths[parent] + ("n{}".format(child_no),)
+                )
+            )
+        parent_paths = paths
+    for path in parent_paths:
+        values[path] = 0.0
+    sizes = rng.lognormal(mean=8, sigma=2, size=len(values))
+    return dict(zip(values, sizes.round().tolist()))
+
+
+def to_stringvalues(pathvalues: Dict[Path, float]) -> Dict[str, float]:
+    """Converts pathvalues to the input of
+    :func:`sunburst.path.stringvalues_to_pv`.
+    """
+    return {str(path): value for path, value in pathvalues.items()}
+
+
+def to_charvalues(pathvalues: Dict[Path, float]) -> Dict[str, float]:
+    """Converts pathvalues to the input of
+    :func:`sunburst.path.charvalues_to_pv` by replacing the i-th child of
+    each node by the i-th letter (paths can coincide if there are more than
+    52 children).
+    """
+    letters = string.ascii_letters
+    return {
+        "".join(letters[int(name[1:]) % len(letters)] for name in path): value
+        for path, value in pathvalues.items()
+    }
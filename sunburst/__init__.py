@@ -1,7 +1,8 @@
-""" SunburstPlot Module """
+"""SunburstPlot Module"""
 
+import importlib
 import pathlib
-from sunburst.plot import SunburstPlot
+import sys
 from sunburst.path import (
     Path,
     paths2dot,
@@ -10,6 +11,9 @@ from sunburst.path import (
     charlist_to_ordered_pv,
     charvalues_to_pv,
 )
+from sunburst.tree import PathTree, PathTreeBuilder
+from sunburst.io import read_tree
+from sunburst.stats import Stats, NullStats
 from sunburst.calc import (
     complete_pv,
     complete_paths,
@@ -18,6 +22,45 @@ from sunburst.calc import (
     pprint_paths,
     Angles,
     calculate_angles,
+    calculate_angle_arrays,
+    complete_nodes,
+    prune_tree,
+    Structure,
+    nest_structure,
+    text_box_corners,
+    boxes_overlap,
+    CollisionGrid,
 )
 
 base_dir = pathlib.Path(__file__).resolve().parent
+
+# The modules that need matplotlib are only imported when one of their
+# classes is accessed for the first time, so that e.g. sunburst.calc can be
+# used without the start-up cost of matplotlib.
+_LAZY_ATTRIBUTES = {
+    "SunburstPlot": "sunburst.plot",
+    "SunburstAnimation": "sunburst.animation",
+    "plot_figure": "sunburst.render",
+    "render_bytes": "sunburst.render",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    )
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):
+    # no module level __getattr__ (PEP 562)
+    from sunburst.plot import SunburstPlot  # noqa: F401
+    from sunburst.animation import SunburstAnimation  # noqa: F401
+    from sunburst.render import plot_figure, render_bytes  # noqa: F401
@@ -0,0 +1,239 @@
+from typing import Dict, List, Optional, Sequence, Type, Union, cast
+import numpy as np
+from matplotlib.animation import FuncAnimation
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from sunburst.calc import Angles, calculate_angle_arrays
+from sunburst.path import Path
+from sunburst.plot import SunburstPlot
+from sunburst.tree import PathTree, PathTreeBuilder
+
+
+class SunburstAnimation(object):
+    """Animates a sunburst chart over a sequence of pathvalue snapshots
+    (e.g. one per time interval) with
+    :class:`matplotlib.animation.FuncAnimation`.
+
+    The layout is computed once for the union of the paths of all
+    snapshots, with one wedge per path. The order of the wedges is
+    determined by the sum of the values of all snapshots (see
+    :py:attr:`sunburst.plot.SunburstPlot.order`), so that wedges do not
+    change places between frames. Each frame only changes the angles,
+    colors and visibility of these wedges and reuses a pool of text
+    artists for the annotations, so no artists are created or
+    destroyed while the animation runs.
+
+    Usage:
+        - Initialize SunburstAnimation object with the snapshots (dicts
+          of type Dict[Path, float] or PathTrees), the axes and further
+          keyword arguments of `plot_class` (e.g. ``plot_center=True``,
+          ``prune_minimal_angle`` is not supported)
+        - Run SunburstAnimation.animate() and show or save the animation
+
+    Attributes:
+        plot: The :class:`~sunburst.plot.SunburstPlot` (or an instance of
+            the subclass `plot_class`) of the union of all snapshots. Its
+            methods (e.g. :py:meth:`~sunburst.plot.SunburstPlot.face_color`)
+            determine the looks of every frame.
+        transition_frames: Number of frames between two snapshots, in
+            which the values are interpolated linearly.
+        labels: Annotate the wedges
+    """
+
+    def __init__(
+        self,
+        snapshots: Sequence[Union[Dict[Path, float], PathTree]],
+        axes: Optional[Axes] = None,
+        transition_frames: int = 0,
+        labels: bool = True,
+        plot_class: Type[SunburstPlot] = SunburstPlot,
+        **plot_kwargs,
+    ):
+        if not snapshots:
+            raise ValueError("At least one snapshot is needed.")
+        if plot_kwargs.get("prune_minimal_angle"):
+            raise ValueError(
+                "SunburstAnimation does not support prune_minimal_angle."
+            )
+        self.transition_frames = transition_frames
+        self.labels = labels
+        max_depth = plot_kwargs.get("max_depth")
+
+        # *** Union of all snapshots ***                               (emph)
+        builder = PathTreeBuilder()
+        # node ids and values of each snapshot
+        snapshot_items = []
+        for snapshot in snapshots:
+            if isinstance(snapshot, PathTree):
+                snapshot = snapshot.to_pv()
+            nodes = []
+            values = []
+            for path, value in snapshot.items():
+                if not path:
+                    raise ValueError(
+                        "The empty path is not allowed in the snapshots."
+                    )
+                if max_depth is not None:
+                    path = path[:max_depth]
+                # the value of the union is the sum of all snapshots
+                nodes.append(builder.add(path, value))
+                values.append(value)
+            snapshot_items.append((nodes, values))
+        union = builder.build()
+        # completed values of every node (column) in every snapshot (row)
+        subtree_values = np.zeros((len(union), len(snapshots)))
+        for column, (nodes, values) in enumerate(snapshot_items):
+            np.add.at(subtree_values[:, column], nodes, values)
+        for level in reversed(union.levels()[1:]):
+            np.add.at(subtree_values, union.parent[level], subtree_values[level])
+        self._subtree_values = np.ascontiguousarray(subtree_values.T)
+
+        # *** Artists ***                                               (emph)
+        self.plot = plot_class(union, axes, **plot_kwargs)
+        self.plot.prepare_data()
+        # the wedges of all paths, even if they are too small in the union
+        wedges = self.plot.wedges
+        self._paths = [
+            path
+            for path in self.plot._completed_paths
+            if path or self.plot.plot_center
+        ]
+        self._wedges = [
+            wedges.get(path) or self.plot.wedge(path) for path in self._paths
+        ]
+        self.plot.wedges = dict(zip(self._paths, self._wedges))
+        self._nodes = np.array(
+            [self.plot._node_index[path] for path in self._paths],
+            dtype=np.int64,
+        )
+
+    @property
+    def n_frames(self) -> int:
+        """Total number of frames."""
+        n_snapshots = len(self._subtree_values)
+        return (n_snapshots - 1) * (self.transition_frames + 1) + 1
+
+    def frame_values(self, frame: int) -> np.ndarray:
+        """Returns the completed values of all nodes of the union in frame
+        number `frame` (indexed by the node ids of the tree of
+        :py:attr:`plot`).
+        """
+        if not 0 <= frame < self.n_frames:
+            raise IndexError("Frame {} does not exist.".format(frame))
+        snapshot, step = divmod(frame, self.transition_frames + 1)
+        if not step:
+            return self._subtree_values[snapshot]
+        fraction = step / (self.transition_frames + 1)
+        previous, following = self._subtree_values[snapshot : snapshot + 2]
+        return previous + fraction * (following - previous)
+
+    def draw(self, setup_axes: bool = True) -> None:
+        """Adds the wedges to the axes and shows the first frame.
+
+        Args:
+            setup_axes: See :py:meth:`sunburst.plot.SunburstPlot.plot`
+        """
+        axes = self.plot.axes
+        for wedge in self._wedges:
+            axes.add_artist(wedge)
+        # the wedges move, so we reserve the space of the whole chart
+        radius = float(self.plot._outer_radius.max(initial=0))
+        origin = self.plot.origin
+        axes.update_datalim(
+            [
+                (origin[0] - radius, origin[1] - radius),
+                (origin[0] + radius, origin[1] + radius),
+            ]
+        )
+        if setup_axes:
+            self.plot._setup_axes()
+        self.draw_frame(0)
+
+    def draw_frame(self, frame: int) -> List[Artist]:
+        """Updates the wedges and annotations to show frame number `frame`.
+
+        Returns:
+            All visible artists of the chart (which have to be drawn when
+            blitting)
+        """
+        plot = self.plot
+        tree = plot._tree
+        tree.subtree_value = self.frame_values(frame)
+        if not tree.subtree_value[0] > 0:
+            for wedge in self._wedges:
+                wedge.set_visible(False)
+            plot._show_labels([])
+            return []
+        plot._theta1, plot._theta2 = calculate_angle_arrays(
+            plot._structure, tree
+        )
+        plot._face_colors = plot._calculate_face_colors()
+        theta1 = plot._theta1[self._nodes]
+        theta2 = plot._theta2[self._nodes]
+        values = tree.subtree_value[self._nodes]
+        shown = (theta2 - theta1 > plot.plot_minimal_angle) | (self._nodes == 0)
+
+        artists = []  # type: List[Artist]
+        shown_paths = []
+        for wedge, path, show, start, end, value in zip(
+            self._wedges,
+            self._paths,
+            shown.tolist(),
+            theta1.tolist(),
+            theta2.tolist(),
+            values.tolist(),
+        ):
+            if not show:
+                wedge.set_visible(False)
+                continue
+            plot._angles[path] = Angles(start, end)
+            plot._completed_pv[path] = value
+            wedge.set_theta1(start)
+            wedge.set_theta2(end)
+            wedge.set_facecolor(plot.face_color(path))
+            wedge.set_visible(True)
+            artists.append(wedge)
+            shown_paths.append(path)
+
+        if self.labels:
+            if plot.cull_labels:
+                labels = [props for _, props in plot._place_labels(shown_paths)]
+            else:
+                labels = []
+                for path in shown_paths:
+                    text_types = plot._text_types(path)
+                    if text_types:
+                        labels.append(plot._text_props(path, text_types[0]))
+            artists.extend(plot._show_labels(labels))
+        return artists
+
+    def animate(
+        self,
+        interval: int = 200,
+        blit: bool = True,
+        setup_axes: bool = True,
+        **kwargs,
+    ) -> FuncAnimation:
+        """Draws the chart and returns the animation of all frames.
+
+        Args:
+            interval: Delay between frames in milliseconds
+            blit: Only redraw the chart (not the whole figure) in every
+                frame
+            setup_axes: See :py:meth:`sunburst.plot.SunburstPlot.plot`
+            **kwargs: Further keyword arguments of
+                :class:`matplotlib.animation.FuncAnimation`
+
+        Returns:
+            The animation (keep a reference to it while it runs)
+        """
+        self.draw(setup_axes)
+        return FuncAnimation(
+            cast(Figure, self.plot.axes.figure),
+            self.draw_frame,
+            frames=self.n_frames,
+            interval=interval,
+            blit=blit,
+            **kwargs,
+        )
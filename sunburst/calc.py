@@ -1,7 +1,8 @@
 import collections
-from itertools import groupby
-from typing import List, Dict, DefaultDict
+from typing import List, Dict, DefaultDict, Union, Optional, Set, Tuple, cast
+import numpy as np
 from sunburst.path import Path
+from sunburst.tree import PathTree
 
 
 # future: sorting & unsorting
@@ -11,7 +12,11 @@ from sunburst.path import Path
 # thus the real (empty) root always carries the total sum of the entries
 # and gets set by complete_pv
 # to plot the innerst circle, bring back the draw_center_circle option
-def complete_pv(pathvalues: Dict[Path, float]) -> Dict[Path, float]:
+def complete_pv(
+    pathvalues: Union[Dict[Path, float], PathTree],
+    vectorized=False,
+    max_depth: Optional[int] = None,
+) -> Union[Dict[Path, float], PathTree]:
     """Consider a pathvalue dictionary of the form Dict[Path, float] e.g.
     {1.1.1: 12.0} (here: only one entry). This function will disect each path
     and assign its value to the truncated path: e.g. here 1, 1.1 and 1.1.1.
@@ -20,39 +25,186 @@ def complete_pv(pathvalues: Dict[Path, float]) -> Dict[Path, float]:
     Furthermore the total sum of the items of
     the topmost level will be assigned to the empty path. For this to make
     sense we require that no empty path is in the data beforehand""
-    :param pathvalues: {path: value} dictionary
+    If a :class:`~sunburst.tree.PathTree` is given, its subtree values are
+    computed instead and the (completed) tree is returned.
+    :param pathvalues: {path: value} dictionary or PathTree
+    :param vectorized: Resolve the parent of every path only once (by
+        converting to a PathTree) and sum up the values level by level
+        with numpy instead of adding the value of each path to all of
+        its ancestors. Much faster for large or deep trees.
+    :param max_depth: Roll up all paths longer than max_depth: their
+        values are only assigned to their ancestors up to this depth, the
+        paths themselves are not part of the result.
+        For a PathTree, a truncated copy is completed and returned
+        (see :py:meth:`sunburst.tree.PathTree.truncate`).
     :return: {path: value}
-    dictionary
+    dictionary or PathTree
     """
+    if isinstance(pathvalues, PathTree):
+        if max_depth is not None:
+            pathvalues = pathvalues.truncate(max_depth)
+        return pathvalues.complete()
     if Path(()) in pathvalues:
         raise ValueError(
             "This function does not allow the empty path as item"
             "in the data list."
         )
+    if vectorized:
+        tree = PathTree.from_pv(pathvalues, max_depth=max_depth)
+        return tree.complete().to_completed_pv()
     completed: DefaultDict[Path, float] = collections.defaultdict(float)
     for path, value in pathvalues.items():
-        # len(path) +1 ensures that also the whole tag is considered
+        depth = len(path)
+        if max_depth is not None:
+            depth = min(depth, max_depth)
+        # depth +1 ensures that also the whole tag is considered
         # starting point 0: also add to empty path.
-        for level in range(0, len(path) + 1):
+        for level in range(0, depth + 1):
             completed[path[:level]] += value
     return dict(completed)
 
 
-def complete_paths(paths: List[Path]) -> List[Path]:
-    """Like complete_pv, only that it tries to preserve the order of paths."""
+def prune_tree(
+    tree: PathTree, minimal_angle: float, other: Optional[str] = None
+) -> PathTree:
+    """Removes all subtrees of a completed tree whose wedges would have an
+    angle smaller than `minimal_angle` (in degrees).
+
+    Args:
+        tree: Completed PathTree
+        minimal_angle: Minimal angle of the wedges that are kept
+        other: If given, the values of the removed children of each node
+            are collected in a new child with this name. If the node
+            already has a child of that name, the values are added to it
+            instead.
+
+    Returns:
+        New completed PathTree
+    """
+    if tree.subtree_value is None:
+        raise ValueError("Tree has not been completed yet.")
+    subtree_value = tree.subtree_value
+    keep = 360 * subtree_value >= minimal_angle * subtree_value[0]
+    keep[0] = True
+    # the angles can only shrink towards the leaves, but we make sure
+    # that no node is kept without its parent.
+    for level in tree.levels()[1:]:
+        keep[level] &= keep[tree.parent[level]]
+    pruned = tree.select(keep)
+    if other is None:
+        return pruned
+
+    # the topmost removed nodes
+    removed = np.flatnonzero(~keep & keep[np.maximum(tree.parent, 0)])
+    other_value = np.bincount(
+        tree.parent[removed],
+        weights=subtree_value[removed],
+        minlength=len(tree),
+    )
+    parents = np.flatnonzero(other_value)
+    if not len(parents):
+        return pruned
+    new_id = np.cumsum(keep) - 1
+    # nodes that already have a child with the name `other`
+    existing = {}  # type: Dict[int, int]
+    if other in tree.components:
+        other_id = tree.components.index(other)
+        for node in np.flatnonzero(pruned.component == other_id).tolist():
+            existing[int(pruned.parent[node])] = node
+    new_parents = []
+    new_values = []
+    for parent in parents.tolist():
+        value = other_value[parent]
+        parent = int(new_id[parent])
+        if parent in existing:
+            node = existing[parent]
+            pruned.value[node] += value
+            cast(np.ndarray, pruned.subtree_value)[node] += value
+        else:
+            new_parents.append(parent)
+            new_values.append(value)
+    return pruned.add_leaves(
+        np.array(new_parents, dtype=np.int64),
+        [other] * len(new_parents),
+        np.array(new_values),
+    )
+
+
+def complete_paths(paths: Union[List[Path], PathTree]) -> List[Path]:
+    """Like complete_pv, only that it tries to preserve the order of paths.
+    For a :class:`~sunburst.tree.PathTree`, the order of the input data of
+    the tree is used.
+    """
+    if isinstance(paths, PathTree):
+        tree_paths = paths.paths()
+        return [tree_paths[node] for node in complete_nodes(paths)]
+    # use sets for the membership tests, else this is quadratic in the
+    # number of paths
+    given = set(paths)
+    inserted = set()
     ret = [Path(())]
     for path in paths:
         for i in range(1, len(path)):
             # iterate over all "real" ancestors
             ancestor = path[:i]
-            if ancestor not in paths and ancestor not in ret:
+            if ancestor not in given and ancestor not in inserted:
                 # will not come up later: insert before path
+                inserted.add(ancestor)
                 ret.append(ancestor)
         ret.append(path)
     return ret
 
 
-def structure_paths(paths: List[Path]) -> List[List[List[Path]]]:
+def complete_nodes(
+    tree: PathTree, nodes: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Array version of :func:`complete_paths`: Takes the node ids `nodes`
+    of `tree` (per default all nodes that were part of the input data, in
+    input order) and inserts all missing ancestors right before their first
+    descendant. The root node is always the first node of the result (and
+    only there).
+    """
+    n = len(tree)
+    if nodes is None:
+        nodes = tree.input_nodes()
+    # position of the node in the final order: given nodes keep their
+    # position, missing ancestors take the position of their first
+    # descendant. Nodes that are not needed keep the position n.
+    position = np.full(n, n, dtype=np.int64)
+    position[nodes] = np.arange(len(nodes))
+    given = position < n
+    first_descendant = position.copy()
+    for level in reversed(tree.levels()[1:]):
+        np.minimum.at(
+            first_descendant, tree.parent[level], first_descendant[level]
+        )
+    position = np.where(given, position, first_descendant)
+    position[0] = -1
+    # ancestors that are inserted before the same path are ordered by depth
+    ret = np.lexsort((tree.depth, position))
+    return ret[: np.count_nonzero(position < n)]
+
+
+Structure = collections.namedtuple(
+    "Structure", ["items", "group_offsets", "level_offsets"]
+)
+Structure.__doc__ = """Paths grouped by length and parent, as returned by
+:func:`structure_paths` with ``offsets=True``.
+
+Attributes:
+    items: The paths (or node ids) sorted by length and parent
+    group_offsets: Group ``i`` consists of
+        ``items[group_offsets[i]:group_offsets[i + 1]]``
+    level_offsets: The groups of level ``j`` are the groups
+        ``level_offsets[j]`` to ``level_offsets[j + 1] - 1``
+"""
+
+
+def structure_paths(
+    paths: Union[List[Path], PathTree],
+    nodes: Optional[np.ndarray] = None,
+    offsets=False,
+) -> Union[List[List[List[Path]]], Structure]:
     """Takes a list of paths and groups the paths first by length (empty
     path length 0) and then by the parent (path[:len(path) - 1]).
     Example:
@@ -63,35 +215,89 @@ def structure_paths(paths: List[Path]) -> List[List[List[Path]]]:
         [ [1.1, 1.2], [3.1, 3.2] ],  # grouped by parents
         [ [1.1.1, 1.1.2], [1.2.1, 1.2.2], [3.1.1], [3.2.1] ]
     ]
-    :param paths: Paths
+    The order of the paths within each group is the order of `paths`. The
+    groups of one level are ordered lexicographically by their parent for
+    a list of paths and by the position of their parent (i.e. its node id)
+    for a PathTree. The input is not modified.
+    :param paths: Paths (or PathTree)
+    :param nodes: Only for PathTree: The node ids to group (in this order),
+        per default all nodes of the tree.
+    :param offsets: Return a :class:`Structure` with the sorted paths (or
+        node ids for a PathTree) and the group boundaries as integer
+        offsets instead of nested lists.
     :return: [[Paths grouped by parents] grouped by levels.]
     """
+    # Everything boils down to one stable sort by (length, parent id)
+    if isinstance(paths, PathTree):
+        tree = paths
+        if nodes is None:
+            nodes = np.arange(len(tree))
+        items = nodes  # type: Union[np.ndarray, List[Path]]
+        depth = tree.depth[nodes]
+        parent = tree.parent[nodes]
+    else:
+        items = paths
+        # the id of the parent is its rank among all parents, so that the
+        # groups of one level are sorted lexicographically by their parent
+        parent_paths = [
+            tuple.__getitem__(path, slice(None, -1)) for path in paths
+        ]
+        rank = {
+            path: i for i, path in enumerate(sorted(set(parent_paths)))
+        }  # type: Dict[Tuple[str, ...], int]
+        depth = np.fromiter((len(path) for path in paths), int, len(paths))
+        parent = np.fromiter(
+            (rank[path] for path in parent_paths), np.int64, len(paths)
+        )
+    order = np.lexsort((parent, depth))
+    depth = depth[order]
+    parent = parent[order]
+    if isinstance(items, np.ndarray):
+        items = items[order]
+    else:
+        items = [items[i] for i in order]
 
-    structured = []  # return value
-
-    # we do this in two stepts via the iteritems.groupby function, first
-    # using the level, then the parent function as keys.
-    # (Note that sorting is necessary before calling groupby!)
-
-    def level(path):
-        return len(path)
-
-    def parent(path):
-        return path.parent()
+    n = len(order)
+    if n:
+        changes = (np.diff(depth) != 0) | (np.diff(parent) != 0)
+        group_offsets = np.concatenate(([0], np.flatnonzero(changes) + 1, [n]))
+        group_depth = depth[group_offsets[:-1]]
+        level_offsets = np.concatenate(
+            (
+                [0],
+                np.flatnonzero(np.diff(group_depth)) + 1,
+                [len(group_depth)],
+            )
+        )
+    else:
+        group_offsets = np.zeros(1, dtype=np.int64)
+        level_offsets = np.zeros(1, dtype=np.int64)
+    structure = Structure(items, group_offsets, level_offsets)
+    if offsets:
+        return structure
+    if isinstance(paths, PathTree):
+        tree_paths = paths.paths()
+        structure = Structure(
+            [tree_paths[node] for node in structure.items],
+            group_offsets,
+            level_offsets,
+        )
+    return nest_structure(structure)
 
-    # sort by level
-    paths.sort(key=level)
-    paths_by_level = (list(group) for _, group in groupby(paths, key=level))
 
-    # sort by parent
-    for paths_of_level in paths_by_level:
-        paths_of_level.sort(key=parent)
-        paths_by_parent = [
-            list(group) for _, group in groupby(paths_of_level, key=parent)
+def nest_structure(structure: Structure) -> List[List[List[Path]]]:
+    """Converts a :class:`Structure` to the nested lists returned by
+    :func:`structure_paths`.
+    """
+    items, group_offsets, level_offsets = structure
+    group_offsets = group_offsets.tolist()
+    return [
+        [
+            list(items[group_offsets[group] : group_offsets[group + 1]])
+            for group in range(level_offsets[level], level_offsets[level + 1])
         ]
-        structured.append(paths_by_parent)
-
-    return structured
+        for level in range(len(level_offsets) - 1)
+    ]
 
 
 def pprint_structured_paths(structurized: List[List[List[Path]]]):
@@ -111,34 +317,253 @@ def pprint_paths(paths: List[Path]):
 Angles = collections.namedtuple("Angles", ["theta1", "theta2"])
 
 
-# todo: docstring . path values must be complete_pv!
 def calculate_angles(
-    structured_paths: List[List[List[Path]]],
-    path_values: Dict[Path, float],
+    structured_paths: Union[List[List[List[Path]]], Structure],
+    path_values: Union[Dict[Path, float], PathTree],
 ) -> Dict[Path, Angles]:
-    angles: Dict[Path, Angles] = {}  # return value
-    # the total sum of all elements (on one level)
-    value_sum = path_values[Path(())]
-    for level_no, groups in enumerate(structured_paths):
-        for group in groups:
-            theta2 = None  # else pycharm complains about theta2 undefined
-            for path_no, path in enumerate(group):
-                # First we determine the starting angle  (theta1) for the wedge
-                # corresponding to the path.
-                if level_no == 0:
-                    # This corresponds to the inner circle (because level 0
-                    # only contains the empty path, the root of the whole tree)
-                    theta1 = 0
-                elif path_no == 0:
-                    # The first path of a group. Since the wedges must be
-                    # aligned with the parent, we have to get this value
-                    # from the parent.
-                    theta1 = angles[path.parent()].theta1
-                else:
-                    # we continue the wedge where the previous one had stopped
-                    theta1 = theta2  # type: ignore
-                # Now we determine the ending angle based on the fraction of
-                # the value.
-                theta2 = theta1 + 360 * path_values[path] / value_sum
-                angles[path] = Angles(theta1, theta2)
-    return angles
+    """Calculates the start and end angle of the wedge of every path.
+
+    Args:
+        structured_paths: Paths as returned by :func:`structure_paths`
+            (nested lists or Structure with paths or node ids of
+            `path_values`)
+        path_values: Completed pathvalues (see :func:`complete_pv`) or
+            completed PathTree
+
+    Returns:
+        {path: Angles} dictionary
+    """
+    if isinstance(structured_paths, Structure):
+        structure = structured_paths
+    else:
+        structure = _flatten_structure(structured_paths)
+    if isinstance(path_values, PathTree):
+        tree = path_values
+        if len(structure.items) and isinstance(structure.items[0], Path):
+            node_index = tree.node_index()
+            structure = structure._replace(
+                items=np.array(
+                    [node_index[path] for path in structure.items],
+                    dtype=np.int64,
+                )
+            )
+        theta1, theta2 = calculate_angle_arrays(structure, tree)
+        paths = tree.paths()
+        return {
+            paths[node]: Angles(t1, t2)
+            for node, t1, t2 in zip(
+                structure.items.tolist(),
+                theta1[structure.items].tolist(),
+                theta2[structure.items].tolist(),
+            )
+        }
+    items = structure.items
+    position = {path: i for i, path in enumerate(items)}
+    parent_position = np.array(
+        [
+            position.get(tuple.__getitem__(path, slice(None, -1)), -1)
+            for path in items
+        ],
+        dtype=np.int64,
+    )
+    values = np.array([path_values[path] for path in items], dtype=float)
+    theta1, theta2 = _segmented_angles(
+        structure, values, parent_position, path_values[Path(())]
+    )
+    return {
+        path: Angles(t1, t2)
+        for path, t1, t2 in zip(items, theta1.tolist(), theta2.tolist())
+    }
+
+
+def calculate_angle_arrays(
+    structure: Structure, tree: PathTree
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Array version of :func:`calculate_angles`.
+
+    Args:
+        structure: Structure of node ids of `tree` as returned by
+            :func:`structure_paths` with ``offsets=True``
+        tree: Completed PathTree
+
+    Returns:
+        Start and end angles (theta1, theta2) of the wedges, indexed
+        by node id (NaN for nodes that are not part of `structure`).
+    """
+    if tree.subtree_value is None:
+        raise ValueError("Tree has not been completed yet.")
+    items = structure.items
+    position = np.full(len(tree), -1, dtype=np.int64)
+    position[items] = np.arange(len(items))
+    parent_position = position[tree.parent[items]]
+    theta1_items, theta2_items = _segmented_angles(
+        structure,
+        tree.subtree_value[items],
+        parent_position,
+        tree.subtree_value[0],
+    )
+    theta1 = np.full(len(tree), np.nan)
+    theta2 = np.full(len(tree), np.nan)
+    theta1[items] = theta1_items
+    theta2[items] = theta2_items
+    return theta1, theta2
+
+
+def _flatten_structure(structured_paths: List[List[List[Path]]]) -> Structure:
+    """Inverse of :func:`nest_structure`."""
+    items = [
+        path for groups in structured_paths for group in groups for path in group
+    ]
+    group_sizes = [len(group) for groups in structured_paths for group in groups]
+    level_sizes = [len(groups) for groups in structured_paths]
+    return Structure(
+        items,
+        np.concatenate(([0], np.cumsum(group_sizes, dtype=np.int64))),
+        np.concatenate(([0], np.cumsum(level_sizes, dtype=np.int64))),
+    )
+
+
+def _segmented_angles(
+    structure: Structure,
+    values: np.ndarray,
+    parent_position: np.ndarray,
+    value_sum: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculates the angles of all items of the structure, one level at
+    a time.
+
+    The wedges of a group are placed next to each other, starting at the
+    start angle of the parent. So the start angle of a wedge is the start
+    angle of its parent plus the cumulative sum of the angular spans of
+    its predecessors in the group.
+
+    Args:
+        structure: Structure
+        values: Completed values of the items of the structure
+        parent_position: Position of the parent of each item in the items
+            of the structure
+        value_sum: The total sum of all elements
+
+    Returns:
+        theta1, theta2 for every item of the structure
+    """
+    group_offsets = structure.group_offsets
+    level_offsets = structure.level_offsets
+    span = 360 * np.asarray(values, dtype=float) / value_sum
+    theta1 = np.zeros(len(span))
+    theta2 = np.zeros(len(span))
+    for level_no in range(len(level_offsets) - 1):
+        first_group = level_offsets[level_no]
+        last_group = level_offsets[level_no + 1]
+        start = group_offsets[first_group]
+        stop = group_offsets[last_group]
+        if level_no == 0:
+            # This corresponds to the inner circle (because level 0
+            # only contains the empty path, the root of the whole tree)
+            theta1[start:stop] = 0
+            theta2[start:stop] = span[start:stop]
+            continue
+        group_starts = group_offsets[first_group:last_group]
+        group_sizes = np.diff(group_offsets[first_group : last_group + 1])
+        level_span = span[start:stop]
+        # segmented (exclusive) cumulative sum: cumulative sum over the
+        # whole level minus the cumulative sum up to the group start
+        cumulative = np.cumsum(level_span) - level_span
+        group_base = np.repeat(cumulative[group_starts - start], group_sizes)
+        # the first wedge of a group is aligned with the parent
+        parents = parent_position[start:stop]
+        if len(parents) and parents.min() < 0:
+            raise ValueError("The parents of all paths must be structured.")
+        level_theta1 = theta1[parents] + (cumulative - group_base)
+        level_theta2 = level_theta1 + level_span
+        # don't let rounding errors push the wedges beyond their parents
+        theta1[start:stop] = level_theta1
+        theta2[start:stop] = np.minimum(level_theta2, theta2[parents])
+    return theta1, theta2
+
+
+def text_box_corners(
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+    rotation: float,
+    ha: str = "center",
+    va: str = "center",
+) -> np.ndarray:
+    """Corners of the box of a text of size `width` x `height`, rotated by
+    `rotation` degrees and aligned at (x, y). Like matplotlib (with the
+    default rotation mode), the alignment refers to the bounding box of
+    the rotated text.
+    :param ha: horizontal alignment: "left", "center" or "right"
+    :param va: vertical alignment: "bottom", "center" or "top"
+    :return: array of shape (4, 2)
+    """
+    cos, sin = np.cos(np.deg2rad(rotation)), np.sin(np.deg2rad(rotation))
+    corners = np.array(
+        [[0.0, 0.0], [width, 0.0], [width, height], [0.0, height]]
+    ).dot([[cos, sin], [-sin, cos]])
+    low, high = corners.min(axis=0), corners.max(axis=0)
+    anchor_x = {"left": low[0], "center": (low[0] + high[0]) / 2}.get(
+        ha, high[0]
+    )
+    anchor_y = {"bottom": low[1], "center": (low[1] + high[1]) / 2}.get(
+        va, high[1]
+    )
+    return corners + (x - anchor_x, y - anchor_y)
+
+
+def boxes_overlap(box1: np.ndarray, box2: np.ndarray) -> bool:
+    """Tests if two (rotated) rectangles, given by their corners in order,
+    overlap (touching does not count), using the separating axis theorem.
+    """
+    for box in (box1, box2):
+        # the normals of two adjacent edges are the candidate axes
+        edges = box[1:3] - box[0:2]
+        for normal in (edges[:, ::-1] * (-1, 1)).tolist():
+            projection1 = box1.dot(normal)
+            projection2 = box2.dot(normal)
+            if (
+                projection1.max() <= projection2.min()
+                or projection2.max() <= projection1.min()
+            ):
+                return False
+    return True
+
+
+class CollisionGrid(object):
+    """Spatial index of (rotated) rectangles for collision tests.
+
+    Every rectangle is registered in all cells of a regular grid that its
+    bounding box touches, so a collision test only has to consider the
+    rectangles of a few cells instead of all of them.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.boxes = []  # type: List[np.ndarray]
+        self._cells = collections.defaultdict(
+            list
+        )  # type: DefaultDict[Tuple[int, int], List[int]]
+
+    def _cells_of(self, box: np.ndarray) -> List[Tuple[int, int]]:
+        low = np.floor(box.min(axis=0) / self.cell_size).astype(int)
+        high = np.floor(box.max(axis=0) / self.cell_size).astype(int)
+        return [
+            (i, j)
+            for i in range(low[0], high[0] + 1)
+            for j in range(low[1], high[1] + 1)
+        ]
+
+    def collides(self, box: np.ndarray) -> bool:
+        """Tests if `box` overlaps with any of the added rectangles."""
+        candidates = set()  # type: Set[int]
+        for cell in self._cells_of(box):
+            candidates.update(self._cells.get(cell, ()))
+        return any(boxes_overlap(box, self.boxes[i]) for i in candidates)
+
+    def add(self, box: np.ndarray) -> None:
+        """Adds a rectangle, given by its corners (array of shape (4, 2))."""
+        for cell in self._cells_of(box):
+            self._cells[cell].append(len(self.boxes))
+        self.boxes.append(box)
@@ -2,8 +2,7 @@
 
 import pathlib
 import matplotlib.pyplot as plt
-from sunburst import SunburstPlot, Path
-import csv
+from sunburst import SunburstPlot, Path, read_tree
 import os
 
 fig, ((ax0, ax1), (ax2, ax3)) = plt.subplots(2, 2)
@@ -18,13 +17,7 @@ file_size_data_file = (
     pathlib.Path(__file__).resolve().parent / "data" / "file_sizes.txt"
 )
 
-data = {}
-with open(file_size_data_file) as csvfile:
-    reader = csv.reader(csvfile, delimiter="\t")
-    for row in reader:
-        if not len(row) == 2:
-            continue
-        data[Path(row[1].split("/"))] = float(row[0])
+data = read_tree(file_size_data_file)
 
 
 axs[0].set_title("Explosion scaled with (1/depth)^2")
@@ -2,8 +2,7 @@
 
 import pathlib
 import matplotlib.pyplot as plt
-from sunburst import SunburstPlot, Path
-import csv
+from sunburst import SunburstPlot, read_tree
 import os
 
 # read data
@@ -15,13 +14,7 @@ file_size_data_file = (
 fig, ax = plt.subplots()
 
 
-data = {}
-with open(file_size_data_file) as csvfile:
-    reader = csv.reader(csvfile, delimiter="\t")
-    for row in reader:
-        if not len(row) == 2:
-            continue
-        data[Path(row[1].split("/"))] = float(row[0])
+data = read_tree(file_size_data_file)
 
 # do the magic
 
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+import pathlib
+import os
+import matplotlib.pyplot as plt
+from sunburst import SunburstPlot
+from sunburst.scan import scan
+
+fig, ax = plt.subplots()
+
+# scan the sunburst package (instead of reading the output of du)
+
+data = scan(
+    pathlib.Path(__file__).resolve().parent.parent,
+    exclude=["__pycache__", "*.png"],
+    max_depth=3,
+)
+
+# do the magic
+
+sbp = SunburstPlot(
+    data,
+    ax,
+    cmap=plt.get_cmap("hsv"),
+    label_minimal_angle=5,
+)
+
+# Do not display values
+sbp.format_value_text = lambda value: ""  # type: ignore
+
+sbp.plot(setup_axes=True)
+
+# set plot attributes
+ax.set_title("Disk Usage Chart (scanned)")
+
+# save/show plot
+
+fig.set_size_inches(10, 10)
+fig.savefig(
+    pathlib.Path(__file__).resolve().parent
+    / "figures"
+    / "disk_usage_scan_plot.png",
+    dpi=100,
+    bbox_inches="tight",
+)
+
+if "NOPLOT" not in os.environ:
+    plt.show()
@@ -0,0 +1,160 @@
+import contextlib
+import csv
+import gzip
+import io
+import os
+import sys
+from typing import IO, Iterator, List, Optional, Union, cast
+import numpy as np
+from sunburst.tree import PathTree, PathTreeBuilder
+
+#: Default number of bytes read at once by :func:`read_tree`
+CHUNK_SIZE = 1 << 20
+
+
+def read_tree(
+    source: Union[str, os.PathLike, IO],
+    delimiter: str = "\t",
+    separator: str = "/",
+    cumulative: bool = False,
+    max_depth: Optional[int] = None,
+    encoding: str = "utf-8",
+    chunk_size: int = CHUNK_SIZE,
+) -> PathTree:
+    """Reads a file with one ``value<delimiter>path`` row per line (e.g. the
+    output of ``du``) into a :class:`~sunburst.tree.PathTree`.
+
+    The file is read in chunks and the rows are added to a
+    :class:`~sunburst.tree.PathTreeBuilder` directly, without creating a
+    :class:`~sunburst.path.Path` for every row. Rows that do not have
+    exactly two columns are skipped. If the delimiter is a tab, only the
+    first tab of a row separates the columns, so that the paths can
+    contain tabs.
+
+    Args:
+        source: File name, "-" for stdin or a (text or binary) file object.
+            Gzip compressed input is detected automatically (except for
+            file objects in text mode).
+        delimiter: Column delimiter, e.g. "\\t" (du) or "," (csv). Unless
+            it is a tab, quoted columns are supported like in csv files.
+        separator: Separator of the path components
+        cumulative: The values already include the values of all
+            descendants (like directory sizes in the output of ``du``).
+            The values of the children are subtracted, so that the
+            :py:attr:`~sunburst.tree.PathTree.value` of a node is its own
+            value. Ancestors that are not listed (e.g. the directories
+            above the scanned one in the absolute paths of
+            ``du -a /usr/share/foo``) get the value 0.
+        max_depth: Roll up the paths that are more than `max_depth` levels
+            deep (see :py:meth:`sunburst.tree.PathTree.truncate`),
+            counting the shallowest path of the input as level 1, so
+            that leading components of absolute paths do not count.
+        encoding: Encoding of the file (undecodable bytes are kept as
+            surrogates)
+        chunk_size: Approximate number of bytes to read at once
+
+    Returns:
+        The tree (not completed yet), with the rows in input order.
+    """
+    args = (delimiter, separator, cumulative, max_depth, chunk_size)
+    if isinstance(source, io.TextIOBase):
+        return _read_tree(cast(IO, source), *args)
+    if source == "-":
+        source = sys.stdin.buffer
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as binary:
+            with _text_stream(binary, encoding) as stream:
+                return _read_tree(stream, *args)
+    with _text_stream(source, encoding) as stream:
+        return _read_tree(stream, *args)
+
+
+@contextlib.contextmanager
+def _text_stream(binary: IO, encoding: str) -> Iterator[IO]:
+    """Wraps a binary stream in a text stream, decompressing it if it starts
+    with the gzip magic number. The binary stream is not closed.
+    """
+    buffered = None
+    if not hasattr(binary, "peek"):
+        # we need to look at the first bytes without consuming them
+        binary = buffered = io.BufferedReader(binary)  # type: ignore
+    if binary.peek(2)[:2] == b"\x1f\x8b":  # type: ignore
+        binary = gzip.GzipFile(fileobj=binary, mode="rb")  # type: ignore
+    text = io.TextIOWrapper(
+        binary,  # type: ignore
+        encoding=encoding,
+        errors="surrogateescape",
+        newline="",
+    )
+    try:
+        yield text
+    finally:
+        # closing (or garbage collecting) the wrappers would close the
+        # underlying stream, e.g. stdin
+        text.detach()
+        if buffered is not None:
+            buffered.detach()
+
+
+def _read_rows(
+    stream: IO, delimiter: str, chunk_size: int
+) -> Iterator[List[str]]:
+    """Yields the rows of `stream`, reading `chunk_size` bytes at once."""
+    while True:
+        lines = stream.readlines(chunk_size)
+        if not lines:
+            return
+        if delimiter == "\t":
+            # du neither quotes its output nor escapes tabs in file names,
+            # so everything after the first tab is the path
+            for line in lines:
+                yield line.rstrip("\r\n").split(delimiter, 1)
+        else:
+            yield from csv.reader(lines, delimiter=delimiter)
+
+
+def _read_tree(
+    stream: IO,
+    delimiter: str,
+    separator: str,
+    cumulative: bool,
+    max_depth: Optional[int],
+    chunk_size: int,
+) -> PathTree:
+    builder = PathTreeBuilder()
+    # the rows of one directory are usually adjacent (e.g. in the output of
+    # du -a), so we remember the node of the last parent directory
+    last_parent_path = None  # type: Optional[str]
+    last_parent = 0
+    for row_no, row in enumerate(_read_rows(stream, delimiter, chunk_size)):
+        if len(row) != 2:
+            continue
+        try:
+            value = float(row[0])
+        except ValueError:
+            raise ValueError(
+                "Row {}: {!r} is not a number.".format(row_no + 1, row[0])
+            ) from None
+        path = row[1]
+        parent_path, _, name = path.rpartition(separator)
+        if parent_path and parent_path == last_parent_path:
+            builder.add_child(last_parent, name, value)
+        elif not parent_path and separator not in path:
+            builder.add_child(0, name, value)
+        else:
+            last_parent_path = parent_path
+            last_parent = builder.node(parent_path.split(separator))
+            builder.add_child(last_parent, name, value)
+    tree = builder.build()
+    has_row = tree.input_order >= 0
+    if cumulative:
+        children_value = np.bincount(
+            tree.parent[1:], weights=tree.value[1:], minlength=len(tree)
+        )
+        # nodes without a row of their own (e.g. the root) keep the value 0
+        tree.value = np.where(has_row, tree.value - children_value, 0.0)
+    if max_depth is not None and has_row.any():
+        # the depth of the shallowest row counts as 1
+        offset = int(tree.depth[has_row].min()) - 1
+        tree = tree.truncate(offset + max_depth)
+    return tree
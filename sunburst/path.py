@@ -28,17 +28,20 @@ class Path(tuple):
         )
 
     def __getitem__(self, key):
-        result = tuple.__getitem__(tuple(self), key)
+        result = tuple.__getitem__(self, key)
         # todo: is this good style? Stands in contrast to the behaviour of other
         #  iterators...
         # Depending on whether key was a single int or a slice object ,
         # tuple.__getitem__ will return a tuple or a string. However,
         # we want our __getitem__ method to return a Path instance in either
         # way!
+        # The items have already been checked when self was created, so
+        # we skip __new__ here (this method is called a lot).
         if isinstance(result, tuple):
-            return Path(result)
+            return tuple.__new__(Path, result)
         elif isinstance(result, str):
-            return Path((result,))  # do not remove ',' or it's gonna be a str
+            # do not remove ',' or it's gonna be a str
+            return tuple.__new__(Path, (result,))
 
     def startswith(self, tag):
         if not isinstance(tag, Path):
@@ -1,15 +1,57 @@
-from typing import Dict, Tuple, List, Optional
-import matplotlib.pyplot as plt
+from typing import Dict, Tuple, List, Optional, Union, cast
+import bisect
+import math
+import matplotlib
+from matplotlib.axes import Axes
 from matplotlib.patches import Wedge
+from matplotlib.text import Annotation, Text
+from matplotlib.collections import PatchCollection
 import numpy as np
 from sunburst.calc import (
     complete_pv,
-    complete_paths,
+    prune_tree,
+    complete_nodes,
     structure_paths,
-    calculate_angles,
+    nest_structure,
+    calculate_angle_arrays,
     Angles,
+    Structure,
+    text_box_corners,
+    CollisionGrid,
 )
 from sunburst.path import Path
+from sunburst.stats import Stats, make_stats
+from sunburst.tree import PathTree
+
+# minimal inner radius, maximal outer radius, start angles and node ids of
+# the wedges of one ring, see SunburstPlot.path_at
+HitRing = Tuple[float, float, List[float], List[int]]
+
+#: The methods of SunburstPlot that are meant to be redefined, whose calls
+#: are counted by SunburstPlot.stats
+HOOKS = (
+    "wedge_width",
+    "wedge_spacing",
+    "edge_color",
+    "line_width",
+    "face_color",
+    "alpha",
+    "textbox_props",
+    "format_path_text",
+    "format_value_text",
+    "format_text",
+)
+
+
+def _get_cmap(name: str):
+    """Returns the registered colormap `name`."""
+    try:
+        return matplotlib.colormaps[name]
+    except AttributeError:
+        # matplotlib < 3.5
+        from matplotlib import cm
+
+        return cm.get_cmap(name)  # type: ignore
 
 
 class SunburstPlot(object):
@@ -42,10 +84,12 @@ class SunburstPlot(object):
 
     Attributes:
         pathvalues: pathvalues of type
-            MutuableMapping[Path, float]
+            MutuableMapping[Path, float] or a
+            :class:`~sunburst.tree.PathTree`
         axes:
         origin: Coordinates of the center of the pie chart as tuple
-        cmap: Colormap: Controls the coloring based on the angle.
+        cmap: Colormap (or the name of a registered colormap): Controls the
+            coloring based on the angle. Default: "autumn"
         base_ring_width: Default width of each ring/wedge.
         base_edge_color: Default edge color of the wedges.
         base_line_width: Default line width of the wedges.
@@ -72,14 +116,40 @@ class SunburstPlot(object):
         base_textbox_props: Properties of the textbox (bbox) that annotating
             the wedge corresponding to `path`. See
             http://matplotlib.org/users/annotations_guide.html
+        prune_minimal_angle: Remove all paths (and their descendants) whose
+            wedges would have an angle smaller than this value before
+            doing any other computations. Unlike plot_minimal_angle, this
+            also saves the time needed to lay out these paths.
+        prune_other: If set, the values of the removed children of a path
+            are shown as an additional child of this name
+            (e.g. "other"), see :func:`sunburst.calc.prune_tree`.
+        max_depth: Only plot the innermost max_depth rings. The values
+            of deeper paths are rolled up into their ancestor at this
+            depth while the data is prepared, so no wedges or labels are
+            created for them.
+        cull_labels: Do not add annotations that would overlap with the
+            annotations of wedges with bigger values. If possible, such
+            an annotation is rotated the other way (radially instead of
+            tangentially or vice versa) instead of being dropped.
+        label_minimal_size: Only with ``plot(lazy_labels=True)``: only
+            label wedges whose arc is at least this long (in points) at
+            the current zoom level.
+        stats: Collect the durations of the stages of
+            :py:meth:`.prepare_data` and :py:meth:`.plot` and counters
+            (e.g. of created and skipped wedges and labels and of the
+            calls of the methods in :py:data:`HOOKS`) in
+            :py:attr:`stats`. If None, this is enabled by the
+            environment variable ``SUNBURST_STATS`` (see
+            :mod:`sunburst.stats`). When disabled, :py:attr:`stats` is a
+            :class:`~sunburst.stats.NullStats` that records nothing.
     """
 
     def __init__(
         self,
-        input_pv: Dict[Path, float],
-        axes: Optional[plt.Axes] = None,  # todo: make optional argument?
+        input_pv: Union[Dict[Path, float], PathTree],
+        axes: Optional[Axes] = None,  # todo: make optional argument?
         origin=(0.0, 0.0),
-        cmap=plt.get_cmap("autumn"),
+        cmap=None,
         base_ring_width=0.4,
         base_edge_color=(0, 0, 0, 1),
         base_line_width=0.75,
@@ -88,9 +158,22 @@ class SunburstPlot(object):
         label_minimal_angle=0,
         order="value reverse",
         base_textbox_props=None,
+        prune_minimal_angle=0,
+        prune_other=None,
+        max_depth=None,
+        cull_labels=False,
+        label_minimal_size=15,
+        stats=None,
     ):
         if axes is None:
+            # only import pyplot (and set up a backend) if it is needed
+            import matplotlib.pyplot as plt
+
             axes = plt.gca()
+        if cmap is None:
+            cmap = "autumn"
+        if isinstance(cmap, str):
+            cmap = _get_cmap(cmap)
         # *** Input & Config ***                                        (emph)
         self.input_pv = input_pv
         self.axes = axes
@@ -104,6 +187,11 @@ class SunburstPlot(object):
         self.label_minimal_angle = label_minimal_angle
         self.order = order
         self.base_textbox_props = base_textbox_props
+        self.prune_minimal_angle = prune_minimal_angle
+        self.prune_other = prune_other
+        self.max_depth = max_depth
+        self.cull_labels = cull_labels
+        self.label_minimal_size = label_minimal_size
         if not base_textbox_props:
             self.base_textbox_props = dict(
                 boxstyle="round, pad=0.2",
@@ -113,14 +201,50 @@ class SunburstPlot(object):
             )
 
         # *** Variables used for computation ***                        (emph)
+        self._tree = PathTree.from_pv({})  # type: PathTree
         self._completed_pv = {}  # type: Dict[Path, float]
         self._completed_paths = []  # type: List[Path]
         self._max_level = 0  # type: int
+        self._structure = Structure(
+            np.zeros(0, dtype=np.int64),
+            np.zeros(1, dtype=np.int64),
+            np.zeros(1, dtype=np.int64),
+        )  # type: Structure
         self._structured_paths = []  # type: List[List[List[Path]]]
         self._angles = {}  # type: Dict[Path, Angles]
+        # The following arrays are indexed by the node ids of self._tree,
+        # self._node_index maps paths to their node ids.
+        self._node_index = {}  # type: Dict[Path, int]
+        # start and end angles
+        self._theta1 = np.empty(0)  # type: np.ndarray
+        self._theta2 = np.empty(0)  # type: np.ndarray
+        # does the node have descendants?
+        self._has_children = np.empty(0, dtype=bool)  # type: np.ndarray
+        # radii of the wedges
+        self._inner_radius = np.empty(0)  # type: np.ndarray
+        self._outer_radius = np.empty(0)  # type: np.ndarray
+        # default face colors (RGBA)
+        self._face_colors = np.empty((0, 4))  # type: np.ndarray
 
         # *** "Output" *** (emph)
         self.wedges = {}  # type: Dict[Path, Wedge]
+        self.stats = make_stats(stats)  # type: Stats
+        # render argument of plot (None before plot was called)
+        self._render = None  # type: Optional[str]
+        # only with plot(render="collection")
+        self.collection = None  # type: Optional[PatchCollection]
+        self.collection_index = {}  # type: Dict[Path, int]
+        # only with plot(interactive=True, blit=True)
+        self.hover_overlay = None  # type: Optional[Wedge]
+        self.tooltip = None  # type: Optional[Annotation]
+        # only with plot(lazy_labels=True)
+        self.label_pool = []  # type: List[Text]
+        self._label_view = None  # type: Optional[Tuple]
+        # only with plot() without lazy_labels and interactive: the
+        # annotation of each path, kept up to date by update
+        self._labels = None  # type: Optional[Dict[Path, Text]]
+        # for path_at: the wedges of each ring, sorted by their start angle
+        self._hit_index = None  # type: Optional[List[HitRing]]
 
     def prepare_data(self) -> None:
         """Sets up auxiliary variables.
@@ -131,16 +255,132 @@ class SunburstPlot(object):
 
         # todo: maybe join together with self.plot?
         # todo maybe split up more....
-        # even if self.input_pv is of type OrderedDict,
-        # self._completed_pv will be a normal (unsorted) dictionary
-        self._completed_pv = complete_pv(self.input_pv)
+        stats = self.stats
+        self._count_hook_calls()
+        # All computations start from the array based representation
+        # of the input data.
+        with stats.timer("tree"):
+            if isinstance(self.input_pv, PathTree):
+                tree = self.input_pv
+            else:
+                tree = PathTree.from_pv(self.input_pv, max_depth=self.max_depth)
+        if stats.enabled:
+            stats.count("input_nodes", len(tree.input_nodes()))
+        with stats.timer("completion"):
+            self._tree = cast(
+                PathTree, complete_pv(tree, max_depth=self.max_depth)
+            )
+        stats.count("completed_nodes", len(self._tree))
+        if self.prune_minimal_angle:
+            with stats.timer("pruning"):
+                self._tree = prune_tree(
+                    self._tree, self.prune_minimal_angle, self.prune_other
+                )
+            stats.count("pruned_nodes", len(self._tree))
+        with stats.timer("completion"):
+            # even if self.input_pv is of type OrderedDict,
+            # self._completed_pv will be a normal (unsorted) dictionary
+            self._completed_pv = self._tree.to_completed_pv()
+        self._arrange_nodes()
+        with stats.timer("angles"):
+            paths = self._tree.paths()
+            self._angles = {
+                paths[node]: Angles(theta1, theta2)
+                for node, theta1, theta2 in zip(
+                    self._structure.items.tolist(),
+                    self._theta1[self._structure.items].tolist(),
+                    self._theta2[self._structure.items].tolist(),
+                )
+            }
+
+        with stats.timer("radii"):
+            self._inner_radius, self._outer_radius = self._calculate_radii()
+        with stats.timer("colors"):
+            self._face_colors = self._calculate_face_colors()
 
+        self._hit_index = None
+        self._create_wedges()
+
+    def _count_hook_calls(self) -> None:
+        """Lets :py:attr:`stats` count the calls of the methods in
+        :py:data:`HOOKS` by wrapping them (including methods that were
+        replaced on the instance since the last call).
+        """
+        if not self.stats.enabled:
+            return
+        for name in HOOKS:
+            method = getattr(self, name)
+            if getattr(method, "_stats_counter", None) is None:
+                setattr(self, name, self.stats.counting(method, "calls:" + name))
+
+    def _create_wedges(self) -> None:
+        """Fills :py:attr:`wedges` with the wedges of all shown paths."""
+        with self.stats.timer("wedges"):
+            for path in self._completed_paths:
+                if self._is_shown(path):
+                    self.wedges[path] = self.wedge(path)
+        if self.stats.enabled:
+            self.stats.count("wedges_created", len(self.wedges))
+            self.stats.count(
+                "wedges_skipped",
+                sum(
+                    1
+                    for path in self._completed_paths
+                    if path and not self._is_shown(path)
+                ),
+            )
+
+    def _arrange_nodes(self) -> None:
+        """Orders the nodes of :py:attr:`_tree` (see :py:attr:`order`),
+        groups them by level and parent and calculates the angles of their
+        wedges.
+        """
+        stats = self.stats
         # Complete the list of paths with possible missing ancestors:
         # Do not take the keys of self._completed_pv, because they will
         # not be sorted anymore. The sorting of self._completed_paths
         # induces the sorting of self._structured_paths which is
         # responsible for the order of the wedges.
-        ordered_paths: List[Path] = []
+        with stats.timer("ordering"):
+            completed_nodes = complete_nodes(self._tree, self._ordered_nodes())
+
+        self._max_level = self._tree.max_depth
+
+        with stats.timer("structuring"):
+            # the order of self._structured paths determines the
+            # arrangement of the wedges afterwards.
+            self._structure = cast(
+                Structure,
+                structure_paths(self._tree, completed_nodes, offsets=True),
+            )
+            # we create the wedges level by level, so that the inner rings
+            # are drawn first
+            paths = self._tree.paths()
+            self._node_index = self._tree.node_index()
+            self._has_children = self._tree.n_children() > 0
+            self._completed_paths = [
+                paths[node] for node in self._structure.items
+            ]
+            self._structured_paths = nest_structure(
+                Structure(
+                    self._completed_paths,
+                    self._structure.group_offsets,
+                    self._structure.level_offsets,
+                )
+            )
+
+        with stats.timer("angles"):
+            self._theta1, self._theta2 = calculate_angle_arrays(
+                self._structure, self._tree
+            )
+
+    def _ordered_nodes(self) -> Optional[np.ndarray]:
+        """Returns the node ids of :py:attr:`_tree` in the order given by
+        :py:attr:`order` (None for the order of the input data).
+        """
+        # We work with the node ids of self._tree here, None meaning the
+        # order of the input data.
+        ordered_nodes: Optional[np.ndarray] = None
 
         if self.order:
             order_options = set(self.order.split(" "))
@@ -163,9 +403,8 @@ class SunburstPlot(object):
             )
 
         if not order_options:
-            ordered_paths = list(self.input_pv.keys())
+            pass
         elif "keep" in self.order:
-            ordered_paths = list(self.input_pv.keys())
             if type(self.input_pv) is dict:
                 # do not use isinstance (because this would yield true for
                 # a OrderedDict or any other (possibly ordered subclass of dict
@@ -176,49 +415,204 @@ class SunburstPlot(object):
                     "which does keep record of the order of its items."
                 )
         elif "value" in self.order:
-            ordered_paths = sorted(
-                self._completed_pv.keys(),
-                key=lambda key: self._completed_pv[key],
+            ordered_nodes = np.argsort(
+                cast(np.ndarray, self._tree.subtree_value), kind="stable"
             )
         elif "key" in self.order:
-            ordered_paths = sorted(self._completed_pv.keys())
+            paths = self._tree.paths()
+            ordered_nodes = np.array(
+                sorted(range(len(paths)), key=paths.__getitem__)
+            )
         if "reverse" in self.order:
-            ordered_paths = list(reversed(ordered_paths))
-
-        self._completed_paths = complete_paths(ordered_paths)
+            if ordered_nodes is None:
+                ordered_nodes = self._tree.input_nodes()
+            ordered_nodes = ordered_nodes[::-1]
 
-        self._max_level = max((len(path) for path in self._completed_paths))
+        return ordered_nodes
 
-        # the order of self._structured paths determines the
-        # arrangement of the wedges afterwards.
-        self._structured_paths = structure_paths(self._completed_paths)
+    def _is_shown(self, path: Path) -> bool:
+        """Returns True if a wedge is created for `path` (see
+        :py:attr:`plot_center` and :py:attr:`plot_minimal_angle`).
+        """
+        if not path:
+            return self.plot_center
+        angle = self._angles[path].theta2 - self._angles[path].theta1
+        return angle > self.plot_minimal_angle
+
+    def update(self, delta_pv: Dict[Path, Optional[float]]) -> None:
+        """Changes the values of some paths, e.g. to refresh a live chart,
+        without preparing all data and creating all wedges again.
+
+        The completed values are only updated along the ancestors of the
+        changed paths (see :py:meth:`sunburst.tree.PathTree.update`). The
+        angles of all wedges are recalculated with a few array operations,
+        but only the wedges whose angles, values or colors changed are
+        modified (in place). Wedges are added for new paths and removed
+        for removed paths (or if their angle drops below
+        :py:attr:`plot_minimal_angle`). Afterwards, :py:attr:`input_pv` is
+        the updated :class:`~sunburst.tree.PathTree`.
+
+        The annotations of the changed, added and removed wedges are
+        updated as well (with :py:attr:`cull_labels`, all annotations are
+        placed again, because every change can affect the collisions). The
+        figure is not redrawn, call ``draw_idle`` of the canvas afterwards.
 
-        self._angles = calculate_angles(
-            self._structured_paths, self._completed_pv
+        Args:
+            delta_pv: New values of the changed paths, None to remove a
+                path. Not supported together with
+                :py:attr:`prune_minimal_angle` and for paths longer than
+                :py:attr:`max_depth`.
+        """
+        if self.prune_minimal_angle:
+            raise ValueError("update does not support prune_minimal_angle.")
+        if self.max_depth is not None and any(
+            len(path) > self.max_depth for path in delta_pv
+        ):
+            raise ValueError("Paths must not be longer than max_depth.")
+        if not self._node_index:
+            # we didn't prepare the data yet
+            self.prepare_data()
+        old_tree = self._tree
+        old_theta1, old_theta2 = self._theta1, self._theta2
+        old_face_colors = self._face_colors
+        tree, old_id = old_tree.update(delta_pv)
+        self.input_pv = self._tree = tree
+        self._arrange_nodes()
+        # the new nodes come after all remaining nodes
+        n_kept = int(np.count_nonzero(old_id >= 0))
+        kept = old_id[:n_kept]
+        self._inner_radius, self._outer_radius = self._calculate_radii(
+            self._inner_radius[kept], self._outer_radius[kept]
+        )
+        self._face_colors = self._calculate_face_colors()
+
+        changed = np.ones(len(tree), dtype=bool)
+        changed[:n_kept] = (
+            (self._theta1[:n_kept] != old_theta1[kept])
+            | (self._theta2[:n_kept] != old_theta2[kept])
+            | (
+                cast(np.ndarray, tree.subtree_value)[:n_kept]
+                != cast(np.ndarray, old_tree.subtree_value)[kept]
+            )
+            | (self._face_colors[:n_kept] != old_face_colors[kept]).any(axis=1)
         )
+        removed_wedges = []
+        # the wedges (or rather, their annotations) to remove and to update
+        removed_paths = []
+        changed_paths = []
+        old_paths = old_tree.paths()
+        for node in np.setdiff1d(np.arange(len(old_tree)), kept).tolist():
+            path = old_paths[node]
+            del self._angles[path]
+            del self._completed_pv[path]
+            if path in self.wedges:
+                removed_wedges.append(self.wedges.pop(path))
+                removed_paths.append(path)
+            # the parent might be the outmost wedge now
+            changed_paths.append(path[:-1])
+        added_wedges = []
+        changed_wedges = []
+        paths = tree.paths()
+        subtree_value = cast(np.ndarray, tree.subtree_value)
+        for node in np.flatnonzero(changed).tolist():
+            path = paths[node]
+            self._angles[path] = Angles(
+                float(self._theta1[node]), float(self._theta2[node])
+            )
+            self._completed_pv[path] = float(subtree_value[node])
+            wedge = self.wedges.get(path)
+            if not self._is_shown(path):
+                if wedge is not None:
+                    removed_wedges.append(self.wedges.pop(path))
+                    removed_paths.append(path)
+                continue
+            changed_paths.append(path)
+            if wedge is None:
+                self.wedges[path] = self.wedge(path)
+                added_wedges.append(self.wedges[path])
+                # the parent is not the outmost wedge anymore
+                changed_paths.append(path[:-1])
+            else:
+                wedge.set_theta1(self._angles[path].theta1)
+                wedge.set_theta2(self._angles[path].theta2)
+                wedge.set_label(self.format_text(path))
+                wedge.set_facecolor(self.face_color(path))
+                changed_wedges.append(path)
+
+        if self._render == "patches":
+            for wedge in removed_wedges:
+                wedge.remove()
+            for wedge in added_wedges:
+                self.axes.add_patch(wedge)
+        elif self.collection is not None:
+            if removed_wedges or added_wedges:
+                self.collection.remove()
+                self._add_collection()
+            else:
+                # modify the paths and face colors in place, set_paths
+                # would convert all wedges again
+                collection_paths = cast(List, self.collection.get_paths())
+                facecolors = cast(np.ndarray, self.collection.get_facecolor())
+                for path in changed_wedges:
+                    wedge = self.wedges[path]
+                    index = self.collection_index[path]
+                    collection_paths[index] = (
+                        wedge.get_transform().transform_path(wedge.get_path())
+                    )
+                    facecolors[index] = wedge.get_facecolor()
+                self.collection.stale = True
+
+        self._hit_index = None
+        if self._labels is not None:
+            self._update_labels(changed_paths, removed_paths)
+        if self._label_view is not None:
+            # lazy labels are connected
+            self._label_view = None
+            self._update_lazy_labels()
+
+    def _update_labels(
+        self, changed_paths: List[Path], removed_paths: List[Path]
+    ) -> None:
+        """Updates the annotations added by :py:meth:`.plot` after
+        :py:meth:`.update`.
 
-        for path in self._completed_paths:
-            if self.plot_center or len(path) >= 1:
-                angle = self._angles[path].theta2 - self._angles[path].theta1
-                if len(path) == 0 or angle > self.plot_minimal_angle:
-                    self.wedges[path] = self.wedge(path)
+        Args:
+            changed_paths: Paths whose annotations are placed again (paths
+                without a wedge are ignored)
+            removed_paths: Paths whose wedges were removed
+        """
+        labels = cast(Dict[Path, Text], self._labels)
+        for path in removed_paths:
+            text = labels.pop(path, None)
+            if text is not None:
+                text.remove()
+        if self.cull_labels:
+            new_labels = dict(self._place_labels())
+            for path in [path for path in labels if path not in new_labels]:
+                labels.pop(path).remove()
+        else:
+            new_labels = {}
+            for path in changed_paths:
+                if path not in self.wedges or path in new_labels:
+                    continue
+                text_types = self._text_types(path)
+                if text_types:
+                    new_labels[path] = self._text_props(path, text_types[0])
+                elif path in labels:
+                    labels.pop(path).remove()
+        for path, props in new_labels.items():
+            text = labels.get(path)
+            if text is None:
+                labels[path] = self.axes.text(**props)
+            else:
+                self._set_text_props(text, props)
 
     def _is_outmost(self, path: Path) -> bool:
         """Returns True if the wedge corresponding to `path` is the
         "outmost" wedge, i.e. there is no descendant of `path`.
         """
         # is there a descendant of path?
-        # to speed up things we use self._structured_paths
-        level = len(path)
-        if level == self._max_level:
-            return True
-        for group in self._structured_paths[level + 1]:
-            for p in group:
-                if p.startswith(path):
-                    return False
-                # all paths in this group start the same
-                continue
-        return True
+        return not self._has_children[self._node_index[path]]
 
     # noinspection PyUnusedLocal
     def wedge_width(self, path: Path) -> float:
@@ -248,7 +642,7 @@ class SunburstPlot(object):
         Instead of redefining this method, adapt :py:meth:`.wedge_width` resp.
         :py:meth:`.wedge_width`.
         """
-        return self._wedge_inner_radius(path) + self.wedge_width(path)
+        return self._outer_radius[self._node_index[path]]
 
     def _wedge_inner_radius(self, path: Path) -> float:
         """The inner radius of the wedge corresponding to a path.
@@ -256,15 +650,56 @@ class SunburstPlot(object):
         Instead of redefining this method, adapt :py:meth:`.wedge_width` resp.
         :py:meth:`.wedge_width`.
         """
-        start = 0 if self.plot_center else 1
-        ancestors = [path[:i] for i in range(start, len(path))]
-        return (
-            sum(
-                self.wedge_width(ancestor) + sum(self.wedge_spacing(ancestor))
-                for ancestor in ancestors
-            )
-            + self.wedge_spacing(path)[0]
-        )
+        return self._inner_radius[self._node_index[path]]
+
+    def _calculate_radii(
+        self,
+        known_inner: Optional[np.ndarray] = None,
+        known_outer: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculates the inner and outer radii of the wedges of all nodes
+        of :py:attr:`_tree` in one top down pass, calling
+        :py:meth:`.wedge_width` and :py:meth:`.wedge_spacing` once per path.
+
+        The inner radius of a wedge is the sum of the widths and spacings of
+        all of its ancestors (only including the center if
+        :py:attr:`plot_center` is set) plus its own spacing before.
+
+        Args:
+            known_inner: Inner radii of the first nodes, which are not
+                calculated again (see :py:meth:`.update`)
+            known_outer: Outer radii of the same nodes
+        """
+        paths = self._tree.paths()
+        parents = self._tree.parent.tolist()
+        inner = [0.0] * len(paths)
+        outer = [0.0] * len(paths)
+        # radius after the wedge of the node and its spacing
+        total = [0.0] * len(paths)
+        n_known = 0
+        if known_inner is not None and known_outer is not None:
+            n_known = len(known_inner)
+            inner[:n_known] = known_inner.tolist()
+            outer[:n_known] = known_outer.tolist()
+            for node in set(parents[n_known:]):
+                if node < n_known and (node or self.plot_center):
+                    total[node] = (
+                        outer[node] + self.wedge_spacing(paths[node])[1]
+                    )
+        elif self.plot_center:
+            width = self.wedge_width(paths[0])
+            spacing = self.wedge_spacing(paths[0])
+            inner[0] = spacing[0]
+            outer[0] = inner[0] + width
+            total[0] = width + sum(spacing)
+        for node in range(max(n_known, 1), len(paths)):
+            width = self.wedge_width(paths[node])
+            spacing = self.wedge_spacing(paths[node])
+            parent_total = total[parents[node]]
+            inner[node] = parent_total + spacing[0]
+            outer[node] = inner[node] + width
+            total[node] = parent_total + (width + sum(spacing))
+        return np.array(inner), np.array(outer)
 
     def _wedge_mid_radius(self, path: Path) -> float:
         """The radius of the middle of the wedge corresponding to a path.
@@ -300,23 +735,28 @@ class SunburstPlot(object):
         inner circle (corresponding to an empty `path`) is always set to be
         white. Colors a slightly brightened with increasing level.
         """
+        # The colors of all wedges are calculated at once by prepare_data
+        return tuple(self._face_colors[self._node_index[path]].tolist())
+
+    def _calculate_face_colors(self) -> np.ndarray:
+        """Calculates the default face colors (see :py:meth:`.face_color`) of
+        all nodes of :py:attr:`_tree` with one call of :py:attr:`.cmap`.
+
+        Returns:
+            RGBA array of shape (number of nodes, 4)
+        """
         # take the middle angle, else the first wedge will have the same color
         # as its parent or at least make sure, that we don't get the value 0
         # (white or black in a lot of color maps)
-        if len(path) == 0:
-            color: List[float] = [1, 1, 1, 1]
-        else:
-            angle = (self._angles[path].theta1 + self._angles[path].theta2) / 2
-            color = list(self.cmap(angle / 360))  # type: ignore
-            # make the color get lighter with increasing level
-            for i in range(3):
-                color[i] += (
-                    (1 - color[i]) * 0.7 * (len(path) / (self._max_level + 1))
-                )
-            # somehow the following seems to be ignored yet
-            # color[3] = 1 - (len(path) - 1)**3 / (self._max_level**3 )
-            # print(color[3])
-        return tuple(color)  # type: ignore
+        angles = (self._theta1 + self._theta2) / 2
+        colors = np.array(self.cmap(angles / 360), dtype=float)
+        # make the color get lighter with increasing level
+        level_factor = self._tree.depth / (self._max_level + 1)
+        colors[:, :3] += (1 - colors[:, :3]) * 0.7 * level_factor[:, np.newaxis]
+        # somehow the following seems to be ignored yet
+        # color[3] = 1 - (len(path) - 1)**3 / (self._max_level**3 )
+        colors[0] = (1, 1, 1, 1)
+        return colors
 
     # noinspection PyUnusedLocal
     # noinspection PyMethodMayBeStatic
@@ -339,7 +779,8 @@ class SunburstPlot(object):
         Args:
             path (Path): path
             text_type (str): Position type of the text box:
-                "tangential", "radial", etc.
+                "tangential", "radial" or "tooltip" (see
+                :py:meth:`.plot` with `blit`).
 
         Returns:
             Dictionary of keyword properties for the bbox option of the
@@ -383,10 +824,16 @@ class SunburstPlot(object):
             return "{} ({})".format(path_text, value_text)
         return path_text
 
-    def _radial_text(self, path: Path) -> None:
+    def _radial_text(self, path: Path) -> Text:
         """Adds a radially rotated annotation for the wedge corresponding to
         `path` to the axes.
         """
+        return self.axes.text(**self._radial_text_props(path))
+
+    def _radial_text_props(self, path: Path) -> Dict:
+        """Keyword arguments of :py:meth:`matplotlib.axes.Axes.text` for a
+        radially rotated annotation of the wedge corresponding to `path`.
+        """
         theta1, theta2 = self._angles[path].theta1, self._angles[path].theta2
         angle = (theta1 + theta2) / 2
         radius = self._wedge_mid_radius(path)
@@ -400,7 +847,7 @@ class SunburstPlot(object):
             rotation = angle
         elif 90 <= angle < 270:
             rotation = angle - 180
-        elif 270 < angle <= 360:
+        elif 270 <= angle <= 360:
             rotation = angle - 360
             # note that a rotation around 360 flips the text, so
             # the -360 does matter.
@@ -428,21 +875,26 @@ class SunburstPlot(object):
             ha = "center"
             va = "center"
 
-        text = self.format_text(path)
-        self.axes.text(
-            mid_x,
-            mid_y,
-            text,
+        return dict(
+            x=mid_x,
+            y=mid_y,
+            s=self.format_text(path),
             ha=ha,
             va=va,
             rotation=rotation,
             bbox=self.textbox_props(path, "radial"),
         )
 
-    def _tangential_text(self, path: Path) -> None:
+    def _tangential_text(self, path: Path) -> Text:
         """Adds a tangentially rotated annotation for the wedge corresponding to
         `path` to the axes.
         """
+        return self.axes.text(**self._tangential_text_props(path))
+
+    def _tangential_text_props(self, path: Path) -> Dict:
+        """Keyword arguments of :py:meth:`matplotlib.axes.Axes.text` for a
+        tangentially rotated annotation of the wedge corresponding to `path`.
+        """
         theta1, theta2 = self._angles[path].theta1, self._angles[path].theta2
         angle = (theta1 + theta2) / 2
         radius = self._wedge_mid_radius(path)
@@ -460,32 +912,240 @@ class SunburstPlot(object):
         else:
             raise ValueError
 
-        text = self.format_text(path)
-        self.axes.text(
-            mid_x,
-            mid_y,
-            text,
+        return dict(
+            x=mid_x,
+            y=mid_y,
+            s=self.format_text(path),
             ha="center",
             va="center",
             rotation=rotation,
             bbox=self.textbox_props(path, "tangential"),
         )
 
-    def _add_annotation(self, path):
-        """Adds annotation to the wedge corresponding to `path`."""
+    def _text_types(self, path: Path) -> List[str]:
+        """The text types ("tangential" or "radial") that can be used for
+        the annotation of the wedge corresponding to `path`, the preferred
+        one first. Returns an empty list if the wedge is not annotated.
+        """
         angle = self._angles[path].theta2 - self._angles[path].theta1
 
         if not angle > self.label_minimal_angle:
             # no text
-            return
+            return []
 
         # fixme: replace with less random criteria!
         if len(path) * angle > 90:
-            self._tangential_text(path)
+            return ["tangential", "radial"]
+        else:
+            return ["radial", "tangential"]
+
+    def _add_annotation(self, path) -> Optional[Text]:
+        """Adds annotation to the wedge corresponding to `path`.
+
+        Returns:
+            The annotation (None if the wedge is not annotated).
+        """
+        text_types = self._text_types(path)
+        if not text_types:
+            return None
+        if text_types[0] == "tangential":
+            return self._tangential_text(path)
         else:
-            self._radial_text(path)
+            return self._radial_text(path)
 
-    def plot(self, setup_axes=False, interactive=False) -> None:
+    def _text_props(self, path: Path, text_type: str) -> Dict:
+        """Keyword arguments of :py:meth:`matplotlib.axes.Axes.text` for an
+        annotation of type `text_type` ("tangential" or "radial") of the
+        wedge corresponding to `path`.
+        """
+        if text_type == "tangential":
+            return self._tangential_text_props(path)
+        return self._radial_text_props(path)
+
+    def _place_labels(
+        self, paths: Optional[List[Path]] = None, scale: Optional[float] = None
+    ) -> List[Tuple[Path, Dict]]:
+        """Chooses the annotations that do not overlap, starting with
+        the wedges of the biggest values. If the preferred text type of
+        a wedge collides with an annotation that was already placed, the
+        other one is tried, otherwise the wedge is not annotated.
+
+        The extents of the texts are only estimated (from the number of
+        characters and the font size).
+
+        Args:
+            paths: Paths of the wedges to annotate (default: all wedges)
+            scale: Size of one data unit in points (default: assume that
+                the chart fills the axes like with
+                ``plot(setup_axes=True)``)
+
+        Returns:
+            The path of the wedge and the keyword arguments of
+            :py:meth:`matplotlib.axes.Axes.text` for every annotation to
+            add.
+        """
+        if paths is None:
+            paths = list(self.wedges)
+        if not paths:
+            return []
+        if scale is None:
+            # the chart and the margins of 10% on each side fill the
+            # smaller side of the axes
+            bbox = self.axes.bbox
+            scale = (
+                min(bbox.width, bbox.height)
+                * 72
+                / self.axes.figure.dpi
+                / (2.4 * float(self._outer_radius.max()))
+            )
+        font_size = float(matplotlib.rcParams["font.size"])
+        grid = CollisionGrid(4 * font_size / scale)
+
+        labels = []
+        for path in sorted(paths, key=lambda p: -self._completed_pv[p]):
+            for text_type in self._text_types(path):
+                props = self._text_props(path, text_type)
+                lines = props["s"].split("\n")
+                # average character width of 0.6 em, line height of 1.2 em
+                # and a padding of 0.3 em of the box on each side
+                width = (0.6 * max(map(len, lines)) + 0.6) * font_size
+                height = (1.2 * len(lines) + 0.6) * font_size
+                box = text_box_corners(
+                    props["x"],
+                    props["y"],
+                    width / scale,
+                    height / scale,
+                    props["rotation"],
+                    props["ha"],
+                    props["va"],
+                )
+                if not grid.collides(box):
+                    grid.add(box)
+                    labels.append((path, props))
+                    break
+        return labels
+
+    def _connect_lazy_labels(self) -> None:
+        """Annotates only the wedges that are visible and big enough at the
+        current view limits and updates the annotations whenever the view
+        limits or the size of the axes change.
+        """
+
+        def on_limits_changed(axes):
+            self._update_lazy_labels()
+
+        def on_draw(event):
+            # the size of the axes changed (e.g. the window was resized)
+            if self._update_lazy_labels():
+                event.canvas.draw_idle()
+
+        self.axes.callbacks.connect("xlim_changed", on_limits_changed)
+        self.axes.callbacks.connect("ylim_changed", on_limits_changed)
+        self.axes.figure.canvas.mpl_connect("draw_event", on_draw)
+        self._update_lazy_labels()
+
+    def _update_lazy_labels(self) -> bool:
+        """Shows the annotations of all wedges that intersect the current
+        view and whose arc (at the middle of the wedge) is at least
+        :py:attr:`label_minimal_size` points long on screen. The
+        :class:`~matplotlib.text.Text` artists are reused.
+
+        Returns:
+            False if the view did not change since the last update (and
+            nothing was done).
+        """
+        xlim, ylim = self.axes.get_xlim(), self.axes.get_ylim()
+        bbox = self.axes.bbox
+        view = (xlim, ylim, bbox.width, bbox.height)
+        if view == self._label_view:
+            return False
+        self._label_view = view
+        if xlim[0] == xlim[1] or ylim[0] == ylim[1]:
+            return True
+        # size of one data unit in points
+        scale = (
+            min(
+                bbox.width / abs(xlim[1] - xlim[0]),
+                bbox.height / abs(ylim[1] - ylim[0]),
+            )
+            * 72
+            / self.axes.figure.dpi
+        )
+
+        nodes = np.array(
+            [self._node_index[path] for path in self.wedges], dtype=np.int64
+        )
+        bounds = self._wedge_bounds(nodes)
+        visible = (
+            (bounds[:, 0] <= max(xlim))
+            & (bounds[:, 2] >= min(xlim))
+            & (bounds[:, 1] <= max(ylim))
+            & (bounds[:, 3] >= min(ylim))
+        )
+        mid_radius = (self._inner_radius[nodes] + self._outer_radius[nodes]) / 2
+        arc_length = (
+            mid_radius
+            * np.deg2rad(self._theta2[nodes] - self._theta1[nodes])
+            * scale
+        )
+        big = arc_length >= self.label_minimal_size
+        paths = self._tree.paths()
+        shown = [paths[node] for node in nodes[visible & big].tolist()]
+
+        if self.cull_labels:
+            labels = [props for _, props in self._place_labels(shown, scale)]
+        else:
+            labels = []
+            for path in shown:
+                text_types = self._text_types(path)
+                if text_types:
+                    labels.append(self._text_props(path, text_types[0]))
+
+        self._show_labels(labels)
+        return True
+
+    def _show_labels(self, labels: List[Dict]) -> List[Text]:
+        """Shows the annotations `labels` (keyword arguments of
+        :py:meth:`matplotlib.axes.Axes.text`) with the text artists of
+        :py:attr:`label_pool`, adding new ones only if there are not enough,
+        and hides the remaining ones.
+
+        Returns:
+            The text artists that are shown.
+        """
+        for index, props in enumerate(labels):
+            if index < len(self.label_pool):
+                text = self.label_pool[index]
+                self._set_text_props(text, props)
+                text.set_visible(True)
+            else:
+                # when zoomed in, the annotations of the wedges at the
+                # edge of the view would extend beyond the axes
+                self.label_pool.append(self.axes.text(clip_on=True, **props))
+        for text in self.label_pool[len(labels) :]:
+            text.set_visible(False)
+        return self.label_pool[: len(labels)]
+
+    @staticmethod
+    def _set_text_props(text: Text, props: Dict) -> None:
+        """Applies the keyword arguments `props` of
+        :py:meth:`matplotlib.axes.Axes.text` to the existing `text`.
+        """
+        text.set_position((props["x"], props["y"]))
+        text.set_text(props["s"])
+        text.set_horizontalalignment(props["ha"])
+        text.set_verticalalignment(props["va"])
+        text.set_rotation(props["rotation"])
+        text.set_bbox(props["bbox"])
+
+    def plot(
+        self,
+        setup_axes=False,
+        interactive=False,
+        render="patches",
+        blit=False,
+        lazy_labels=False,
+    ) -> None:
         """Method that combines several others, to do all necessary
         preparations and add the plot to the axes :py:attr:`self.axes`.
 
@@ -495,40 +1155,324 @@ class SunburstPlot(object):
                but it saves writing a few lines.
             interactive (bool): Display label for the wedge under the cursor
                 only.
+            render (str): "patches": add every wedge as a separate patch
+                to the axes. "collection": add all wedges as one
+                :class:`matplotlib.collections.PatchCollection`
+                (:py:attr:`collection`), which is much faster to draw
+                for large charts. :py:attr:`wedges` still holds the
+                individual wedges and :py:attr:`collection_index` maps
+                each path to its index in the collection.
+            blit (bool): Only with `interactive`: instead of redrawing the
+                whole figure on every mouse movement, cache the static
+                chart after each draw and only draw an overlay over the
+                wedge under the cursor and a tooltip with its label on top
+                of it. Falls back to the default behavior if the canvas
+                does not support blitting.
+            lazy_labels (bool): Only annotate the wedges that intersect the
+                current view of the axes and whose arc is at least
+                :py:attr:`label_minimal_size` points long at the current
+                zoom level. The annotations are updated whenever the view
+                limits change (e.g. when zooming or panning), reusing the
+                text artists of :py:attr:`label_pool`.
         """
+        if render not in ("patches", "collection"):
+            raise ValueError(
+                "'render' must be 'patches' or 'collection', "
+                "not {}.".format(render)
+            )
         if not self.wedges:
             # we didn't prepare the data yet
             self.prepare_data()
-        for path, wedge in self.wedges.items():
-            self.axes.add_patch(wedge)
-            if not interactive:
-                self._add_annotation(path)
+        stats = self.stats
+        self._count_hook_calls()
+        self._render = render
+        with stats.timer("add_wedges"):
+            if render == "collection":
+                self._add_collection()
+            else:
+                for wedge in self.wedges.values():
+                    self.axes.add_patch(wedge)
+        if not interactive and not lazy_labels:
+            n_labels = None  # type: Optional[int]
+            self._labels = {}
+            with stats.timer("labels"):
+                if self.cull_labels:
+                    labels = self._place_labels()
+                    for path, props in labels:
+                        self._labels[path] = self.axes.text(**props)
+                    n_labels = len(labels)
+                else:
+                    for path in self.wedges:
+                        text = self._add_annotation(path)
+                        if text is not None:
+                            self._labels[path] = text
+            if stats.enabled:
+                self._count_labels(n_labels)
 
         if setup_axes:
-            self.axes.autoscale()
-            self.axes.set_aspect("equal")
-            self.axes.autoscale_view(True, True, True)
-            self.axes.axis("off")
-            self.axes.margins(x=0.1, y=0.1)
+            with stats.timer("setup_axes"):
+                self._setup_axes()
+
+        if lazy_labels and not interactive:
+            self._connect_lazy_labels()
 
         if interactive:
+            if blit and self.axes.figure.canvas.supports_blit:
+                self._connect_blitted_hover()
+            else:
+                self._connect_hover()
 
-            def hover(event):
-                if event.inaxes == self.axes:
-                    found = False
-                    for path in self.wedges:
-                        if not found:
-                            cont, ind = self.wedges[path].contains(event)
-                        else:
-                            cont = False
-                        if cont:
-                            self.wedges[path].set_alpha(0.5)
-                            self.axes.set_title(self.format_text(path))
-                        else:
-                            self.wedges[path].set_alpha(1.0)
-                    self.axes.figure.canvas.draw_idle()
-
-            self.axes.figure.canvas.mpl_connect("motion_notify_event", hover)
+    def _count_labels(self, n_labels: Optional[int]) -> None:
+        """Counts the created and skipped annotations of :py:meth:`.plot`.
+
+        Args:
+            n_labels: Number of annotations placed by
+                :py:meth:`._place_labels` (None if all wedges with a
+                text type are annotated)
+        """
+        n_small = sum(1 for path in self.wedges if not self._text_types(path))
+        if n_labels is None:
+            n_labels = len(self.wedges) - n_small
+        self.stats.count("labels_created", n_labels)
+        self.stats.count("labels_skipped_angle", n_small)
+        if self.cull_labels:
+            self.stats.count(
+                "labels_skipped_overlap", len(self.wedges) - n_small - n_labels
+            )
+
+    def _setup_axes(self) -> None:
+        """Does some basic setup for the axes (see :py:meth:`.plot`)."""
+        self.axes.autoscale()
+        self.axes.set_aspect("equal")
+        self.axes.autoscale_view(True, True, True)
+        self.axes.axis("off")
+        self.axes.margins(x=0.1, y=0.1)
+
+    def _add_collection(self) -> None:
+        """Adds all wedges as one :py:attr:`collection` to the axes."""
+        self.collection = PatchCollection(
+            list(self.wedges.values()), match_original=True
+        )
+        self.collection_index = {
+            path: index for index, path in enumerate(self.wedges)
+        }
+        # the automatic data limits of a collection are based on the
+        # control points of the arcs, so we provide the exact ones.
+        self.axes.add_collection(self.collection, autolim=False)
+        self.axes.update_datalim(
+            self._wedge_extent_points(
+                np.array(
+                    [self._node_index[path] for path in self.wedges],
+                    dtype=np.int64,
+                )
+            )
+        )
+
+    def _connect_hover(self) -> None:
+        """Highlights the wedge under the cursor and shows its label as the
+        title of the axes, redrawing the figure each time.
+        """
+        # the currently highlighted path and its original alpha value
+        highlighted = [None, 1.0]  # type: List
+
+        def hover(event):
+            if event.inaxes != self.axes:
+                return
+            path = self.path_at(event.xdata, event.ydata)
+            if path == highlighted[0]:
+                return
+            if highlighted[0] is not None:
+                self._set_wedge_alpha(highlighted[0], highlighted[1])
+            if path is not None:
+                highlighted[1] = self._set_wedge_alpha(path, 0.5)
+                self.axes.set_title(self.format_text(path))
+            highlighted[0] = path
+            self.axes.figure.canvas.draw_idle()
+
+        self.axes.figure.canvas.mpl_connect("motion_notify_event", hover)
+
+    def _connect_blitted_hover(self) -> None:
+        """Highlights the wedge under the cursor and shows its label in a
+        tooltip, using blitting: the figure is only drawn once and copied,
+        afterwards only the overlay and the tooltip (both animated, i.e.
+        skipped by normal draws) are drawn on top of the copy. The cost of
+        a mouse movement therefore does not depend on the number of
+        wedges.
+        """
+        figure = self.axes.figure
+        canvas = figure.canvas
+        # a half transparent white wedge on top has the same effect as
+        # setting the alpha of an opaque wedge to 0.5
+        self.hover_overlay = Wedge(
+            (self.origin[0], self.origin[1]),
+            0,
+            0,
+            0,
+            facecolor=(1, 1, 1, 0.5),
+            edgecolor="none",
+            animated=True,
+            visible=False,
+        )
+        self.axes.add_artist(self.hover_overlay)
+        self.tooltip = self.axes.annotate(
+            "",
+            xy=(0, 0),
+            xytext=(10, 10),
+            textcoords="offset points",
+            annotation_clip=False,
+            animated=True,
+            visible=False,
+        )
+        # copy of the figure without the animated artists
+        background = [None]  # type: List
+
+        def draw_hover_artists():
+            self.axes.draw_artist(self.hover_overlay)
+            self.axes.draw_artist(self.tooltip)
+
+        def on_draw(event):
+            background[0] = canvas.copy_from_bbox(figure.bbox)
+            draw_hover_artists()
+
+        def hover(event):
+            if background[0] is None:
+                return
+            path = None
+            if event.inaxes == self.axes:
+                path = self.path_at(event.xdata, event.ydata)
+            if path is None and not self.hover_overlay.get_visible():
+                return
+            if path is not None:
+                self.hover_overlay.set_radius(self._wedge_outer_radius(path))
+                self.hover_overlay.set_width(
+                    self._wedge_outer_radius(path)
+                    - self._wedge_inner_radius(path)
+                )
+                self.hover_overlay.set_theta1(self._angles[path].theta1)
+                self.hover_overlay.set_theta2(self._angles[path].theta2)
+                self.tooltip.set_text(self.format_text(path))
+                self.tooltip.set_bbox(self.textbox_props(path, "tooltip"))
+                self.tooltip.xy = (event.xdata, event.ydata)
+            self.hover_overlay.set_visible(path is not None)
+            self.tooltip.set_visible(path is not None)
+            canvas.restore_region(background[0])
+            draw_hover_artists()
+            canvas.blit(figure.bbox)
+
+        canvas.mpl_connect("draw_event", on_draw)
+        canvas.mpl_connect("motion_notify_event", hover)
+
+    def path_at(self, x: float, y: float) -> Optional[Path]:
+        """Returns the path of the wedge at the point (x, y) (in data
+        coordinates) or None if there is no wedge.
+
+        The point is converted to polar coordinates around :py:attr:`origin`.
+        Since the wedges of one ring do not overlap, the only candidate of
+        each ring is found by a binary search on their start angles.
+        """
+        if self._hit_index is None:
+            self._hit_index = self._build_hit_index()
+        radius = math.hypot(x - self.origin[0], y - self.origin[1])
+        angle = math.degrees(math.atan2(y - self.origin[1], x - self.origin[0]))
+        angle %= 360
+        for min_inner, max_outer, theta1, nodes in self._hit_index:
+            if not min_inner <= radius <= max_outer:
+                continue
+            index = bisect.bisect_right(theta1, angle) - 1
+            if index < 0:
+                continue
+            node = nodes[index]
+            if (
+                angle <= self._theta2[node]
+                and self._inner_radius[node]
+                <= radius
+                <= self._outer_radius[node]
+            ):
+                return self._tree.path(node)
+        return None
+
+    def _build_hit_index(self) -> List[HitRing]:
+        """Groups the node ids of all wedges by ring for
+        :py:meth:`path_at`.
+        """
+        nodes = np.array(
+            [self._node_index[path] for path in self.wedges], dtype=np.int64
+        )
+        depth = self._tree.depth[nodes]
+        hit_index = []
+        for level in np.unique(depth):
+            level_nodes = nodes[depth == level]
+            # for equal start angles, the wider wedge comes last (and is
+            # found by the binary search)
+            level_nodes = level_nodes[
+                np.lexsort(
+                    (self._theta2[level_nodes], self._theta1[level_nodes])
+                )
+            ]
+            hit_index.append(
+                (
+                    float(self._inner_radius[level_nodes].min()),
+                    float(self._outer_radius[level_nodes].max()),
+                    self._theta1[level_nodes].tolist(),
+                    level_nodes.tolist(),
+                )
+            )
+        return hit_index
+
+    def _set_wedge_alpha(self, path: Path, alpha: float) -> float:
+        """Sets the alpha value of the wedge corresponding to `path` (as
+        drawn, i.e. in :py:attr:`collection` if there is one) and returns
+        the previous value.
+        """
+        if self.collection is not None:
+            # modify the face colors in place, set_facecolors would
+            # convert the colors of all wedges again
+            index = self.collection_index[path]
+            facecolors = cast(np.ndarray, self.collection.get_facecolor())
+            previous = float(facecolors[index, 3])
+            facecolors[index, 3] = alpha
+            self.collection.stale = True
+            return previous
+        wedge = self.wedges[path]
+        wedge_alpha = wedge.get_alpha()  # type: Optional[float]
+        wedge.set_alpha(alpha)
+        return 1.0 if wedge_alpha is None else wedge_alpha
+
+    def _wedge_extent_points(self, nodes: np.ndarray) -> np.ndarray:
+        """Returns points whose bounding box is the bounding box of the
+        wedges of the nodes `nodes`.
+        """
+        bounds = self._wedge_bounds(nodes)
+        return np.concatenate((bounds[:, :2], bounds[:, 2:]))
+
+    def _wedge_bounds(self, nodes: np.ndarray) -> np.ndarray:
+        """Returns the bounding boxes (xmin, ymin, xmax, ymax) of the wedges
+        of the nodes `nodes` as an array of shape (len(nodes), 4), computed
+        from the corners of the wedges and the points where their outer
+        arcs cross the axes.
+        """
+        theta1 = self._theta1[nodes]
+        theta2 = self._theta2[nodes]
+        inner = self._inner_radius[nodes]
+        outer = self._outer_radius[nodes]
+        radii = [inner, inner, outer, outer]
+        angles = [theta1, theta2, theta1, theta2]
+        for axis_angle in range(0, 450, 90):
+            crosses = (theta1 <= axis_angle) & (axis_angle <= theta2)
+            radii.append(np.where(crosses, outer, np.nan))
+            angles.append(np.full(len(nodes), float(axis_angle)))
+        radius = np.array(radii)
+        angle = np.deg2rad(np.array(angles))
+        x = self.origin[0] + radius * np.cos(angle)
+        y = self.origin[1] + radius * np.sin(angle)
+        return np.column_stack(
+            (
+                np.nanmin(x, axis=0),
+                np.nanmin(y, axis=0),
+                np.nanmax(x, axis=0),
+                np.nanmax(y, axis=0),
+            )
+        )
 
     def wedge(self, path: Path) -> Wedge:
         """Generates the patches wedge object corresponding to `path`."""
@@ -537,7 +1481,8 @@ class SunburstPlot(object):
             self._wedge_outer_radius(path),
             self._angles[path].theta1,
             self._angles[path].theta2,
-            width=self.wedge_width(path),
+            width=self._wedge_outer_radius(path)
+            - self._wedge_inner_radius(path),
             label=self.format_text(path),
             facecolor=self.face_color(path),
             edgecolor=self.edge_color(path),
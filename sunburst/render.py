@@ -0,0 +1,80 @@
+import io
+from typing import Dict, Optional, Tuple, Type, Union, cast
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from sunburst.path import Path
+from sunburst.plot import SunburstPlot
+from sunburst.tree import PathTree
+
+
+def plot_figure(
+    pathvalues: Union[Dict[Path, float], PathTree],
+    figsize: Tuple[float, float] = (8.0, 8.0),
+    dpi: float = 100.0,
+    render: str = "patches",
+    plot_class: Type[SunburstPlot] = SunburstPlot,
+    **plot_kwargs,
+) -> SunburstPlot:
+    """Plots a sunburst chart on a new :class:`matplotlib.figure.Figure`
+    with an Agg canvas, without using :mod:`matplotlib.pyplot`.
+
+    The figure is not registered with pyplot, so it is garbage collected
+    like any other object once it is not referenced anymore, and charts
+    can be plotted in several threads at the same time (every thread
+    working on its own figure).
+
+    Args:
+        pathvalues: Pathvalues or :class:`~sunburst.tree.PathTree` to plot
+        figsize: Width and height of the figure in inches
+        dpi: Resolution of the figure in dots per inch
+        render: See :py:meth:`sunburst.plot.SunburstPlot.plot`
+        plot_class: :class:`~sunburst.plot.SunburstPlot` or a subclass
+        **plot_kwargs: Further keyword arguments of `plot_class`
+
+    Returns:
+        The plotted chart, its figure is ``sbp.axes.figure``
+    """
+    figure = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figure)
+    sbp = plot_class(pathvalues, figure.add_subplot(), **plot_kwargs)
+    sbp.plot(setup_axes=True, render=render)
+    return sbp
+
+
+def render_bytes(
+    pathvalues: Union[Dict[Path, float], PathTree],
+    image_format: str = "png",
+    figsize: Tuple[float, float] = (8.0, 8.0),
+    dpi: float = 100.0,
+    render: str = "patches",
+    plot_class: Type[SunburstPlot] = SunburstPlot,
+    savefig_kwargs: Optional[Dict] = None,
+    **plot_kwargs,
+) -> bytes:
+    """Plots a sunburst chart (see :func:`plot_figure`) and returns the
+    image file, e.g. to send it as response of a web server. Safe to call
+    from several threads at the same time.
+
+    Args:
+        pathvalues: Pathvalues or :class:`~sunburst.tree.PathTree` to plot
+        image_format: "png", "svg" or any other format supported by
+            :meth:`matplotlib.figure.Figure.savefig`
+        figsize: Width and height of the figure in inches
+        dpi: Resolution of the figure in dots per inch
+        render: See :py:meth:`sunburst.plot.SunburstPlot.plot`
+        plot_class: :class:`~sunburst.plot.SunburstPlot` or a subclass
+        savefig_kwargs: Further keyword arguments of
+            :meth:`matplotlib.figure.Figure.savefig`
+        **plot_kwargs: Further keyword arguments of `plot_class`
+
+    Returns:
+        Content of the image file
+    """
+    sbp = plot_figure(
+        pathvalues, figsize, dpi, render, plot_class, **plot_kwargs
+    )
+    buffer = io.BytesIO()
+    cast(Figure, sbp.axes.figure).savefig(
+        buffer, format=image_format, **(savefig_kwargs or {})
+    )
+    return buffer.getvalue()
@@ -0,0 +1,294 @@
+import collections
+import concurrent.futures
+import fnmatch
+import json
+import operator
+import os
+import stat as stat_module
+import time
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from sunburst.tree import PathTree, PathTreeBuilder
+
+#: Default number of threads listing directories concurrently
+WORKERS = 16
+
+#: Format version of the cache files of :func:`scan`
+CACHE_VERSION = 1
+
+#: Directories modified less than this many seconds before a scan are not
+#: cached, because further changes might not change their mtime
+CACHE_MIN_AGE = 2
+
+_Listing = collections.namedtuple("_Listing", ["size", "subdirs", "hardlinks"])
+_Listing.__doc__ = """Result of listing one directory.
+
+Attributes:
+    size: Total size of the files in the directory (except for those with
+        several hard links)
+    subdirs: (name, path, stat result) of the subdirectories, sorted by name
+    hardlinks: (device, inode, size) of the files with several hard links
+"""
+
+
+def scan(
+    root: Union[str, os.PathLike],
+    apparent_size: bool = True,
+    follow_symlinks: bool = False,
+    exclude: Iterable[str] = (),
+    max_depth: Optional[int] = None,
+    workers: int = WORKERS,
+    onerror: Optional[Callable[[OSError], None]] = None,
+    cache: Optional[Union[str, os.PathLike]] = None,
+) -> PathTree:
+    """Scans the directory tree below `root` and returns the sizes of all
+    directories as a completed :class:`~sunburst.tree.PathTree`.
+
+    Only directories become nodes of the tree: the value of a node is the
+    size of the directory itself plus the sizes of the files directly in
+    it, so its subtree value is the total size of the directory (like the
+    output of ``du``). The only path of length 1 is the name of `root`.
+    Files with several hard links are only counted once.
+
+    The directories are listed with :func:`os.scandir` by a pool of
+    threads, which speeds up scanning file systems with a high latency
+    (e.g. network file systems) a lot. The resulting tree does not depend
+    on the number of threads.
+
+    Args:
+        root: Directory to scan
+        apparent_size: Use the apparent sizes of the files (the number of
+            bytes they contain) rather than the disk space allocated for
+            them (not supported on all platforms, there the apparent size
+            is used).
+        follow_symlinks: Follow symbolic links to files and directories.
+            Directories that were already visited are skipped.
+        exclude: Glob patterns (see :mod:`fnmatch`) of files and
+            directories to skip. They are matched against the name and
+            the full path of each entry.
+        max_depth: The sizes of directories below this depth are added to
+            their ancestor at this depth instead (they are still scanned).
+        workers: Number of threads
+        onerror: Called with the :class:`OSError` if a directory cannot be
+            listed or a file cannot be examined (from one of the threads).
+            Per default, such errors are ignored.
+        cache: File in which the listing of every directory is stored
+            together with its modification time. If the file exists (and
+            was written by a scan of the same directory with the same
+            options), the files of all directories that were not modified
+            since are not listed again: only the subdirectories are
+            examined (every directory is still visited, because changes
+            below a directory do not change its modification time).
+            Note that this misses files whose size changed without
+            touching the directory (e.g. appending to an existing file).
+
+    Returns:
+        The completed tree of all directories
+    """
+    if max_depth is not None and max_depth < 1:
+        raise ValueError("max_depth must be at least 1.")
+    root = os.fspath(root)
+    root_stat = os.stat(root)
+    absolute = os.path.abspath(root)
+    name = os.path.basename(os.path.normpath(absolute)) or absolute
+    exclude = list(exclude)
+    cache_header = {
+        "version": CACHE_VERSION,
+        "root": absolute,
+        "apparent_size": apparent_size,
+        "follow_symlinks": follow_symlinks,
+        "exclude": exclude,
+    }
+    cached = {}  # type: Dict[str, List]
+    if cache is not None:
+        cached = _read_cache(cache, cache_header)
+    new_cache = {}  # type: Dict[str, List]
+    cache_before_ns = int((time.time() - CACHE_MIN_AGE) * 1e9)
+
+    builder = PathTreeBuilder()
+    # (device, inode) of the files with several hard links that were counted
+    hardlinks_seen = set()  # type: Set[Tuple[int, int]]
+    dirs_seen = {(root_stat.st_dev, root_stat.st_ino)}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+
+        def list_directory(
+            path: str, stat: os.stat_result
+        ) -> concurrent.futures.Future:
+            cached_entry = cached.get(path)
+            if cached_entry is not None and cached_entry[0] == stat.st_mtime_ns:
+                return pool.submit(
+                    _cached_listing, path, cached_entry, follow_symlinks, onerror
+                )
+            return pool.submit(
+                _list_directory,
+                path,
+                apparent_size,
+                follow_symlinks,
+                exclude,
+                onerror,
+            )
+
+        root_node = builder.add_child(0, name, _size(root_stat, apparent_size))
+        # listings are processed in the order they were requested (while
+        # the threads list the following directories), so that the order
+        # of the nodes is deterministic
+        pending = collections.deque(
+            [(list_directory(root, root_stat), root, root_stat, root_node, 1)]
+        )  # type: Deque[Tuple[Any, str, os.stat_result, int, int]]
+        while pending:
+            future, path, dir_stat, node, depth = pending.popleft()
+            listing = future.result()
+            if cache is not None and dir_stat.st_mtime_ns < cache_before_ns:
+                new_cache[path] = [
+                    dir_stat.st_mtime_ns,
+                    listing.size,
+                    [subdir[0] for subdir in listing.subdirs],
+                    listing.hardlinks,
+                ]
+            size = listing.size
+            for device, inode, file_size in listing.hardlinks:
+                if (device, inode) not in hardlinks_seen:
+                    hardlinks_seen.add((device, inode))
+                    size += file_size
+            builder.add_value(node, size)
+            for subdir_name, subdir_path, stat in listing.subdirs:
+                if follow_symlinks:
+                    if (stat.st_dev, stat.st_ino) in dirs_seen:
+                        continue
+                    dirs_seen.add((stat.st_dev, stat.st_ino))
+                child = node
+                if max_depth is None or depth < max_depth:
+                    child = builder.child(node, subdir_name)
+                builder.add_value(child, _size(stat, apparent_size))
+                pending.append(
+                    (
+                        list_directory(subdir_path, stat),
+                        subdir_path,
+                        stat,
+                        child,
+                        depth + 1,
+                    )
+                )
+    if cache is not None:
+        _write_cache(cache, cache_header, new_cache)
+    return builder.build().complete()
+
+
+def _read_cache(
+    cache: Union[str, os.PathLike], header: Dict[str, Any]
+) -> Dict[str, List]:
+    """Returns the directory listings of a cache file, if it exists and
+    matches `header`, otherwise an empty dictionary.
+    """
+    try:
+        with open(cache) as f:
+            content = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(content, dict) or content.get("header") != header:
+        return {}
+    return content.get("directories", {})
+
+
+def _write_cache(
+    cache: Union[str, os.PathLike],
+    header: Dict[str, Any],
+    directories: Dict[str, List],
+) -> None:
+    """Writes a cache file (replacing the old one only once the new one is
+    complete).
+    """
+    temporary = os.fspath(cache) + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump({"header": header, "directories": directories}, f)
+    os.replace(temporary, cache)
+
+
+def _size(stat: os.stat_result, apparent_size: bool) -> int:
+    if apparent_size or not hasattr(stat, "st_blocks"):
+        return stat.st_size
+    # st_blocks is always in units of 512 bytes
+    return stat.st_blocks * 512
+
+
+def _excluded(entry: os.DirEntry, exclude: List[str]) -> bool:
+    return any(
+        fnmatch.fnmatch(entry.name, pattern)
+        or fnmatch.fnmatch(entry.path, pattern)
+        for pattern in exclude
+    )
+
+
+def _cached_listing(
+    path: str,
+    cached_entry: List,
+    follow_symlinks: bool,
+    onerror: Optional[Callable[[OSError], None]],
+) -> _Listing:
+    """Like :func:`_list_directory` for a directory that was not modified
+    since it was cached: only the subdirectories are examined.
+    """
+    _, size, subdir_names, hardlinks = cached_entry
+    subdirs = []
+    for name in subdir_names:
+        subdir_path = os.path.join(path, name)
+        try:
+            if follow_symlinks:
+                stat = os.stat(subdir_path)
+            else:
+                stat = os.lstat(subdir_path)
+        except OSError as error:
+            if onerror is not None:
+                onerror(error)
+            continue
+        if stat_module.S_ISDIR(stat.st_mode):
+            subdirs.append((name, subdir_path, stat))
+    return _Listing(size, subdirs, [tuple(link) for link in hardlinks])
+
+
+def _list_directory(
+    path: str,
+    apparent_size: bool,
+    follow_symlinks: bool,
+    exclude: List[str],
+    onerror: Optional[Callable[[OSError], None]],
+) -> _Listing:
+    """Lists one directory (runs in one of the threads of :func:`scan`)."""
+    size = 0
+    subdirs = []
+    hardlinks = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if exclude and _excluded(entry, exclude):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                    stat = entry.stat(follow_symlinks=follow_symlinks)
+                except OSError as error:
+                    if onerror is not None:
+                        onerror(error)
+                    continue
+                if is_dir:
+                    subdirs.append((entry.name, entry.path, stat))
+                elif stat.st_nlink > 1:
+                    hardlinks.append(
+                        (stat.st_dev, stat.st_ino, _size(stat, apparent_size))
+                    )
+                else:
+                    size += _size(stat, apparent_size)
+    except OSError as error:
+        if onerror is not None:
+            onerror(error)
+    subdirs.sort(key=operator.itemgetter(0))
+    return _Listing(size, subdirs, hardlinks)
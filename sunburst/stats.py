@@ -0,0 +1,197 @@
+import collections
+import functools
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, Optional
+
+#: Environment variable that enables the collection of statistics for all
+#: plots that do not set it explicitly (any value except "", "0", "false",
+#: "no" and "off")
+ENVIRONMENT_VARIABLE = "SUNBURST_STATS"
+
+
+def stats_enabled_by_environment() -> bool:
+    """Returns True if the environment variable
+    :py:data:`ENVIRONMENT_VARIABLE` enables statistics.
+    """
+    value = os.environ.get(ENVIRONMENT_VARIABLE, "")
+    return value.strip().lower() not in ("", "0", "false", "no", "off")
+
+
+class _Timer(object):
+    """Context manager that adds the time spent in its block to a stage
+    of :class:`Stats` and records the peak of the memory allocated in it
+    while :mod:`tracemalloc` is tracing.
+    """
+
+    __slots__ = ("stats", "stage", "start", "memory_start")
+
+    def __init__(self, stats: "Stats", stage: str):
+        self.stats = stats
+        self.stage = stage
+        self.start = 0.0
+        self.memory_start = None  # type: Optional[int]
+
+    def __enter__(self) -> None:
+        # tracemalloc.reset_peak is new in Python 3.9
+        if tracemalloc.is_tracing() and hasattr(tracemalloc, "reset_peak"):
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        duration = time.perf_counter() - self.start
+        durations = self.stats.durations
+        durations[self.stage] = durations.get(self.stage, 0.0) + duration
+        if self.memory_start is not None and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1] - self.memory_start
+            memory = self.stats.memory
+            memory[self.stage] = max(memory.get(self.stage, 0), peak)
+
+
+class _NullTimer(object):
+    """Context manager that does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Stats(object):
+    """Durations of stages and counters of events, e.g. collected by
+    :class:`~sunburst.plot.SunburstPlot` (see its `stats` argument).
+
+    Durations and counters accumulate over repeated stages (e.g. several
+    calls of :py:meth:`~sunburst.plot.SunburstPlot.update`) until
+    :py:meth:`reset`.
+
+    While :mod:`tracemalloc` is tracing (and on Python 3.9 or newer), the
+    peak of the memory allocated in each stage is recorded as well. This
+    resets the peak of :func:`tracemalloc.get_traced_memory` at the start
+    of every stage.
+
+    Usage: ::
+
+        stats = Stats()
+        with stats.timer("layout"):
+            ...
+        stats.count("wedges", 10)
+        print(stats)
+
+    Attributes:
+        enabled: False for the no-op :class:`NullStats`
+        durations: Seconds spent in each stage, in the order in which the
+            stages ran first
+        counters: Value of each counter
+        memory: Peak of the memory allocated by Python in each stage in
+            bytes, the maximum over repeated stages (empty unless
+            :mod:`tracemalloc` was tracing)
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.durations = collections.OrderedDict()  # type: Dict[str, float]
+        self.counters = collections.OrderedDict()  # type: Dict[str, int]
+        self.memory = collections.OrderedDict()  # type: Dict[str, int]
+
+    def reset(self) -> None:
+        """Removes all durations, counters and memory peaks."""
+        self.durations.clear()
+        self.counters.clear()
+        self.memory.clear()
+
+    def timer(self, stage: str):
+        """Returns a context manager that adds the time spent in its block
+        to the duration of `stage`.
+        """
+        return _Timer(self, stage)
+
+    def count(self, counter: str, increment: int = 1) -> None:
+        """Adds `increment` to `counter`."""
+        self.counters[counter] = self.counters.get(counter, 0) + increment
+
+    def counting(self, function: Callable, counter: str) -> Callable:
+        """Returns a wrapper of `function` that increments `counter` on
+        every call.
+        """
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            self.counters[counter] = self.counters.get(counter, 0) + 1
+            return function(*args, **kwargs)
+
+        wrapper._stats_counter = counter  # type: ignore
+        return wrapper
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Returns the durations, counters and (if any were recorded) the
+        memory peaks as (JSON serializable) dictionary.
+        """
+        result = {
+            "durations": dict(self.durations),
+            "counters": dict(self.counters),
+        }  # type: Dict[str, Dict]
+        if self.memory:
+            result["memory"] = dict(self.memory)
+        return result
+
+    def __str__(self) -> str:
+        lines = []
+        if self.durations:
+            width = max(map(len, self.durations))
+            lines.append("Durations:")
+            lines.extend(
+                "    {:<{}} {:10.6f} s".format(stage, width, duration)
+                for stage, duration in self.durations.items()
+            )
+        if self.counters:
+            width = max(map(len, self.counters))
+            lines.append("Counters:")
+            lines.extend(
+                "    {:<{}} {:10d}".format(counter, width, value)
+                for counter, value in self.counters.items()
+            )
+        if self.memory:
+            width = max(map(len, self.memory))
+            lines.append("Memory peaks:")
+            lines.extend(
+                "    {:<{}} {:10d} B".format(stage, width, peak)
+                for stage, peak in self.memory.items()
+            )
+        return "\n".join(lines)
+
+
+class NullStats(Stats):
+    """:class:`Stats` that does not collect anything, so that the
+    instrumentation costs next to nothing when it is switched off.
+    """
+
+    enabled = False
+
+    def timer(self, stage: str):
+        return _NULL_TIMER
+
+    def count(self, counter: str, increment: int = 1) -> None:
+        pass
+
+    def counting(self, function: Callable, counter: str) -> Callable:
+        return function
+
+
+def make_stats(enabled: Optional[bool] = None) -> Stats:
+    """Returns :class:`Stats` if `enabled`, otherwise :class:`NullStats`.
+    If `enabled` is None, the environment variable
+    :py:data:`ENVIRONMENT_VARIABLE` decides.
+    """
+    if enabled is None:
+        enabled = stats_enabled_by_environment()
+    return Stats() if enabled else NullStats()
@@ -0,0 +1,90 @@
+import unittest
+import matplotlib
+from matplotlib.animation import FuncAnimation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from sunburst.animation import SunburstAnimation
+from sunburst.path import Path, stringvalues_to_pv
+from sunburst.plot import SunburstPlot
+
+matplotlib.use("AGG")
+
+
+class SunburstAnimationTest(unittest.TestCase):
+    def setUp(self):
+        self.snapshots = [
+            stringvalues_to_pv({"a": 1.0, "a/x": 2.0, "b": 3.0}),
+            stringvalues_to_pv({"a/x": 4.0, "b/y": 1.0, "c": 5.0}),
+            stringvalues_to_pv({"b": 2.0, "c/z": 2.0}),
+        ]
+        self.figure = Figure()
+        FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot()
+
+    def test_frames(self):
+        animation = SunburstAnimation(
+            self.snapshots, self.axes, transition_frames=2
+        )
+        self.assertEqual(animation.n_frames, 7)
+        animation.draw()
+        for frame in range(animation.n_frames):
+            animation.draw_frame(frame)
+        # the pool of texts is big enough for all frames now
+        artists = set(self.axes.get_children())
+        for snapshot_no, snapshot in enumerate(self.snapshots):
+            with self.subTest(snapshot=snapshot_no):
+                shown = animation.draw_frame(3 * snapshot_no)
+                expected = SunburstPlot(snapshot, Figure().add_subplot())
+                expected.prepare_data()
+                wedges = {
+                    path: wedge
+                    for path, wedge in animation.plot.wedges.items()
+                    if wedge.get_visible()
+                }
+                self.assertEqual(set(wedges), set(expected.wedges))
+                for path, wedge in wedges.items():
+                    self.assertIn(wedge, shown)
+                    # the order of the wedges may differ
+                    expected_wedge = expected.wedges[path]
+                    self.assertAlmostEqual(
+                        wedge.theta2 - wedge.theta1,
+                        expected_wedge.theta2 - expected_wedge.theta1,
+                    )
+                texts = [text for text in shown if text not in wedges.values()]
+                self.assertEqual(
+                    {text.get_text() for text in texts},
+                    {expected.format_text(path) for path in expected.wedges},
+                )
+        # interpolated
+        animation.draw_frame(1)
+        self.assertAlmostEqual(
+            animation.plot.wedges[Path(("c",))].theta2
+            - animation.plot.wedges[Path(("c",))].theta1,
+            360 * (5 / 3) / (6 + (10 - 6) / 3),
+        )
+        with self.assertRaises(IndexError):
+            animation.frame_values(7)
+        # the artists are reused
+        for frame in range(animation.n_frames):
+            animation.draw_frame(frame)
+        self.assertEqual(set(self.axes.get_children()), artists)
+
+    def test_animate(self):
+        animation = SunburstAnimation(
+            self.snapshots + [{}],
+            self.axes,
+            plot_center=True,
+            labels=False,
+        )
+        func_animation = animation.animate(blit=True)
+        self.assertIsInstance(func_animation, FuncAnimation)
+        self.assertIn(animation.plot.wedges[Path(())], animation.draw_frame(0))
+        self.assertEqual(animation.draw_frame(3), [])
+        with self.assertRaises(ValueError):
+            SunburstAnimation([])
+        with self.assertRaises(ValueError):
+            SunburstAnimation(self.snapshots, prune_minimal_angle=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
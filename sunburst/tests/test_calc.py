@@ -1,11 +1,22 @@
 import unittest
+import random
+import numpy as np
 from sunburst.path import charvalues_to_pv
+from sunburst.tree import PathTree
 from sunburst.calc import (
     Path,
     complete_paths,
+    complete_nodes,
     complete_pv,
+    prune_tree,
     structure_paths,
+    nest_structure,
     calculate_angles,
+    calculate_angle_arrays,
+    Angles,
+    text_box_corners,
+    boxes_overlap,
+    CollisionGrid,
 )
 from typing import List
 
@@ -27,6 +38,37 @@ def pathstruct_no_order(pathstruct: List[List[List[Path]]]):
     )
 
 
+def reference_complete_paths(paths: List[Path]) -> List[Path]:
+    """The original (quadratic) implementation of complete_paths"""
+    ret = [Path(())]
+    for path in paths:
+        for i in range(1, len(path)):
+            ancestor = path[:i]
+            if ancestor not in paths and ancestor not in ret:
+                ret.append(ancestor)
+        ret.append(path)
+    return ret
+
+
+def reference_calculate_angles(structured_paths, path_values):
+    """The original (sequential) implementation of calculate_angles"""
+    angles = {}
+    value_sum = path_values[Path(())]
+    for level_no, groups in enumerate(structured_paths):
+        for group in groups:
+            theta2 = None
+            for path_no, path in enumerate(group):
+                if level_no == 0:
+                    theta1 = 0
+                elif path_no == 0:
+                    theta1 = angles[path.parent()].theta1
+                else:
+                    theta1 = theta2
+                theta2 = theta1 + 360 * path_values[path] / value_sum
+                angles[path] = Angles(theta1, theta2)
+    return angles
+
+
 class CalcTest(unittest.TestCase):
     def setUp(self):
         self.pathvalues = charvalues_to_pv(
@@ -120,6 +162,65 @@ class CalcTest(unittest.TestCase):
             sorted(self.hc_complete_pv),
         )
 
+    def test_complete_paths_reference(self):
+        paths = list(self.pathvalues.keys())
+        shuffled = paths[:]
+        random.Random(0).shuffle(shuffled)
+        orders = {
+            "input": paths,
+            "sorted": sorted(paths),
+            "reversed": paths[::-1],
+            "shuffled": shuffled,
+            "leaves first": sorted(paths, key=len, reverse=True),
+            "interleaved": [Path("11"), Path("2"), Path("13"), Path("1")],
+        }
+        for name, ordered in orders.items():
+            with self.subTest(order=name):
+                self.assertEqual(
+                    complete_paths(ordered), reference_complete_paths(ordered)
+                )
+                tree = PathTree.from_pv({path: 1.0 for path in ordered})
+                self.assertEqual(
+                    [tree.path(node) for node in complete_nodes(tree)],
+                    reference_complete_paths(ordered),
+                )
+
+    def test_prune_tree(self):
+        tree = complete_pv(PathTree.from_pv(self.pathvalues))
+        # minimal value: 572 * 30 / 360 = 47.7
+        pruned = prune_tree(tree, 30)
+        self.assertEqual(
+            set(pruned.to_completed_pv()),
+            set(map(Path, ["", "1", "11", "111", "1112", "112", "1121"]))
+            | set(map(Path, ["12", "13", "2"])),
+        )
+        for path, value in pruned.to_completed_pv().items():
+            with self.subTest(path=path):
+                self.assertEqual(value, self.hc_complete_pv[path])
+
+        with_other = prune_tree(tree, 30, other="o")
+        completed = with_other.to_completed_pv()
+        self.assertEqual(completed[Path(())], 572.0)
+        self.assertEqual(completed[Path(("1", "1", "1", "o"))], 15.0)
+        self.assertEqual(completed[Path(("1", "1", "o"))], 27.0)
+        self.assertEqual(completed[Path(("1", "2", "o"))], 72.0)
+        self.assertEqual(completed[Path(("2", "o"))], 43.0)
+        self.assertEqual(len(completed), len(pruned) + 4)
+        # subtree values are still consistent
+        recompleted = complete_pv(PathTree.from_pv(with_other.to_pv()))
+        self.assertEqual(recompleted.to_completed_pv(), completed)
+
+    def test_prune_tree_existing_other(self):
+        tree = complete_pv(
+            PathTree.from_pv(
+                charvalues_to_pv({"ab": 1.0, "ao": 10.0, "ac": 10.0})
+            )
+        )
+        completed = prune_tree(tree, 30, other="o").to_completed_pv()
+        self.assertEqual(completed[Path("ao")], 11.0)
+        self.assertNotIn(Path("ab"), completed)
+        self.assertEqual(completed[Path("a")], 21.0)
+
     def test_complete(self):
         # for better debugging: loop
         calculated = complete_pv(self.pathvalues)
@@ -136,6 +237,42 @@ class CalcTest(unittest.TestCase):
             with self.subTest(key=key):
                 self.assertAlmostEqual(calculated[key], self.hc_complete_pv[key])
 
+    def test_complete_vectorized(self):
+        calculated = complete_pv(self.pathvalues, vectorized=True)
+        self.assertEqual(set(calculated), set(self.hc_complete_pv))
+        for key in self.hc_complete_pv.keys():
+            with self.subTest(key=key):
+                self.assertAlmostEqual(calculated[key], self.hc_complete_pv[key])
+
+    def test_complete_max_depth(self):
+        for max_depth in range(5):
+            expected = {
+                path: value
+                for path, value in self.hc_complete_pv.items()
+                if len(path) <= max_depth
+            }
+            for vectorized in (False, True):
+                with self.subTest(max_depth=max_depth, vectorized=vectorized):
+                    calculated = complete_pv(
+                        self.pathvalues,
+                        vectorized=vectorized,
+                        max_depth=max_depth,
+                    )
+                    self.assertEqual(set(calculated), set(expected))
+                    for key, value in expected.items():
+                        self.assertAlmostEqual(calculated[key], value)
+            with self.subTest(max_depth=max_depth, tree=True):
+                tree = PathTree.from_pv(self.pathvalues)
+                calculated = complete_pv(tree, max_depth=max_depth)
+                self.assertEqual(calculated.to_completed_pv(), expected)
+
+    def test_complete_empty_path(self):
+        pathvalues = {Path(()): 1.0, Path("1"): 2.0}
+        for vectorized in (False, True):
+            with self.subTest(vectorized=vectorized):
+                with self.assertRaises(ValueError):
+                    complete_pv(pathvalues, vectorized=vectorized)
+
     def test_structurize(self):
         calculated = structure_paths(list(self.hc_complete_pv.keys()))
         self.assertEqual(
@@ -143,6 +280,87 @@ class CalcTest(unittest.TestCase):
             pathstruct_no_order(self.hc_structurized_paths),
         )
 
+    def test_structurize_keeps_input(self):
+        paths = list(self.hc_complete_pv.keys())[::-1]
+        copy = paths[:]
+        structure_paths(paths)
+        self.assertEqual(paths, copy)
+
+    def test_structurize_order(self):
+        # within groups, the order of the input is kept
+        paths = sorted(self.hc_complete_pv.keys(), reverse=True)
+        structured = structure_paths(paths)
+        for group in sum(structured, []):
+            with self.subTest(group=group):
+                self.assertEqual(group, sorted(group, reverse=True))
+        # the groups of a level are sorted by their parent
+        for level in structured:
+            parents = [group[0].parent() for group in level]
+            self.assertEqual(parents, sorted(parents))
+
+    def test_structurize_offsets(self):
+        paths = list(self.hc_complete_pv.keys())
+        structure = structure_paths(paths, offsets=True)
+        self.assertEqual(len(structure.items), len(paths))
+        self.assertEqual(structure.group_offsets[-1], len(paths))
+        self.assertEqual(len(structure.level_offsets), 5 + 1)
+        self.assertEqual(nest_structure(structure), structure_paths(paths))
+
+        tree = PathTree.from_pv(self.pathvalues)
+        structure = structure_paths(tree, offsets=True)
+        tree_paths = tree.paths()
+        self.assertEqual(
+            pathstruct_no_order(
+                nest_structure(
+                    structure._replace(
+                        items=[tree_paths[node] for node in structure.items]
+                    )
+                )
+            ),
+            pathstruct_no_order(self.hc_structurized_paths),
+        )
+
+    def test_calculate_angles_reference(self):
+        reference = reference_calculate_angles(
+            self.hc_structurized_paths, self.hc_complete_pv
+        )
+        inputs = {
+            "nested": (self.hc_structurized_paths, self.hc_complete_pv),
+            "structure": (
+                structure_paths(list(self.hc_complete_pv), offsets=True),
+                self.hc_complete_pv,
+            ),
+            "tree": (
+                self.hc_structurized_paths,
+                complete_pv(PathTree.from_pv(self.pathvalues)),
+            ),
+        }
+        for name, (structured, path_values) in inputs.items():
+            with self.subTest(input=name):
+                calculated = calculate_angles(structured, path_values)
+                self.assertEqual(set(calculated), set(reference))
+                for path, angles in reference.items():
+                    self.assertAlmostEqual(calculated[path][0], angles[0])
+                    self.assertAlmostEqual(calculated[path][1], angles[1])
+
+    def test_calculate_angle_arrays(self):
+        tree = complete_pv(PathTree.from_pv(self.pathvalues))
+        # leave out a leaf
+        nodes = complete_nodes(tree)[:-1]
+        theta1, theta2 = calculate_angle_arrays(
+            structure_paths(tree, nodes, offsets=True), tree
+        )
+        angles = calculate_angles(
+            self.hc_structurized_paths, self.hc_complete_pv
+        )
+        for node, path in enumerate(tree.paths()):
+            with self.subTest(path=path):
+                if node in nodes:
+                    self.assertAlmostEqual(theta1[node], angles[path].theta1)
+                    self.assertAlmostEqual(theta2[node], angles[path].theta2)
+                else:
+                    self.assertTrue(np.isnan(theta1[node]))
+
     def test_calculate_angles(self):
         angles_dict = calculate_angles(
             self.hc_structurized_paths, self.hc_complete_pv
@@ -165,3 +383,51 @@ class CalcTest(unittest.TestCase):
                     self.assertLessEqual(angles_dict[ancestor].theta1, theta1)
                     self.assertLessEqual(theta1, theta2)
                     self.assertLessEqual(theta2, angles_dict[ancestor].theta2)
+
+
+class LabelGeometryTest(unittest.TestCase):
+    def test_text_box_corners(self):
+        box = text_box_corners(1, 2, 4, 2, 0)
+        np.testing.assert_allclose(box, [[-1, 1], [3, 1], [3, 3], [-1, 3]])
+        box = text_box_corners(1, 2, 4, 2, 0, ha="left", va="bottom")
+        np.testing.assert_allclose(box, [[1, 2], [5, 2], [5, 4], [1, 4]])
+        # the alignment refers to the bounding box of the rotated text
+        box = text_box_corners(0, 0, 4, 2, 90, ha="right", va="top")
+        np.testing.assert_allclose(box.max(axis=0), [0, 0], atol=1e-12)
+        np.testing.assert_allclose(box.min(axis=0), [-2, -4], atol=1e-12)
+        box = text_box_corners(0, 0, 4, 2, 45)
+        np.testing.assert_allclose(box.mean(axis=0), [0, 0], atol=1e-12)
+
+    def test_boxes_overlap(self):
+        box = text_box_corners(0, 0, 4, 2, 0)
+        self.assertTrue(boxes_overlap(box, text_box_corners(1, 1, 4, 2, 0)))
+        self.assertFalse(boxes_overlap(box, text_box_corners(4, 0, 4, 2, 0)))
+        self.assertTrue(boxes_overlap(box, text_box_corners(0, 0, 4, 2, 90)))
+        # the bounding boxes overlap, the rotated boxes do not
+        diagonal = text_box_corners(0, 0, 10, 1, 45)
+        self.assertFalse(
+            boxes_overlap(diagonal, text_box_corners(3, -3, 2, 2, 0))
+        )
+        self.assertTrue(
+            boxes_overlap(diagonal, text_box_corners(-3, -3, 2, 2, 0))
+        )
+
+    def test_collision_grid(self):
+        random.seed(2)
+        boxes = [
+            text_box_corners(
+                random.uniform(0, 20),
+                random.uniform(0, 20),
+                random.uniform(0.5, 5),
+                random.uniform(0.5, 1),
+                random.uniform(-90, 90),
+            )
+            for _ in range(200)
+        ]
+        grid = CollisionGrid(2)
+        for box in boxes:
+            expected = any(boxes_overlap(box, other) for other in grid.boxes)
+            self.assertEqual(grid.collides(box), expected)
+            if not expected:
+                grid.add(box)
+        self.assertGreater(len(grid.boxes), 1)
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+import unittest
+
+
+def imported_modules(code: str):
+    """Returns the names of all modules that are imported after running
+    `code` in a new interpreter.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            code + "\nimport sys\nprint('\\n'.join(sys.modules))",
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    return set(result.stdout.split())
+
+
+class ImportTest(unittest.TestCase):
+    def test_no_matplotlib(self):
+        modules = imported_modules(
+            "import sunburst\n"
+            "import sunburst.calc, sunburst.io, sunburst.path, sunburst.scan\n"
+            "sunburst.complete_pv(sunburst.stringvalues_to_pv({'a/b': 1}))"
+        )
+        self.assertIn("sunburst.calc", modules)
+        self.assertNotIn("matplotlib", modules)
+        self.assertNotIn("sunburst.plot", modules)
+
+    @unittest.skipIf(sys.version_info < (3, 7), "no module __getattr__")
+    def test_lazy_plot(self):
+        modules = imported_modules(
+            "import sunburst\n"
+            "from matplotlib.figure import Figure\n"
+            "sbp = sunburst.SunburstPlot({}, Figure().add_subplot())\n"
+            "sbp.plot()\n"
+            "sunburst.SunburstAnimation\n"
+            "sunburst.render_bytes(sunburst.stringvalues_to_pv({'a': 1}))"
+        )
+        self.assertIn("sunburst.plot", modules)
+        self.assertIn("sunburst.animation", modules)
+        self.assertIn("sunburst.render", modules)
+        self.assertNotIn("matplotlib.pyplot", modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
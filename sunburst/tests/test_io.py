@@ -0,0 +1,169 @@
+import gzip
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+from sunburst.io import read_tree
+from sunburst.path import Path
+
+
+class ReadTreeTest(unittest.TestCase):
+    def setUp(self):
+        # output of du -a (directories after their contents)
+        self.du = (
+            "4\t./a/x\n"
+            "8\t./a/y\n"
+            "16\t./a\n"
+            "2\t./b\n"
+            "1\t./c/d/z\n"
+            "3\t./c/d\n"
+            "5\t./c\n"
+            "30\t.\n"
+        )
+        self.pathvalues = {
+            Path((".", "a", "x")): 4.0,
+            Path((".", "a", "y")): 8.0,
+            Path((".", "a")): 16.0,
+            Path((".", "b")): 2.0,
+            Path((".", "c", "d", "z")): 1.0,
+            Path((".", "c", "d")): 3.0,
+            Path((".", "c")): 5.0,
+            Path((".",)): 30.0,
+        }
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write(self, name: str, data: bytes) -> str:
+        file_name = os.path.join(self.tmp_dir.name, name)
+        with open(file_name, "wb") as f:
+            f.write(data)
+        return file_name
+
+    def test_file(self):
+        file_name = self.write("du.txt", self.du.encode())
+        for source in (file_name, pathlib.Path(file_name)):
+            with self.subTest(source=source):
+                tree = read_tree(source)
+                self.assertEqual(tree.to_pv(), self.pathvalues)
+                self.assertEqual(list(tree.to_pv()), list(self.pathvalues))
+
+    def test_gzip(self):
+        file_name = self.write("du.txt.gz", gzip.compress(self.du.encode()))
+        self.assertEqual(read_tree(file_name).to_pv(), self.pathvalues)
+
+    def test_file_objects(self):
+        for stream in (
+            io.StringIO(self.du),
+            io.BytesIO(self.du.encode()),
+            io.BytesIO(gzip.compress(self.du.encode())),
+        ):
+            with self.subTest(stream=stream):
+                self.assertEqual(read_tree(stream).to_pv(), self.pathvalues)
+                self.assertFalse(stream.closed)
+
+    def test_stdin(self):
+        stdin = io.TextIOWrapper(io.BytesIO(self.du.encode()))
+        with mock.patch("sys.stdin", stdin):
+            self.assertEqual(read_tree("-").to_pv(), self.pathvalues)
+        self.assertFalse(stdin.buffer.closed)
+
+    def test_chunks(self):
+        for chunk_size in (1, 10, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                tree = read_tree(io.StringIO(self.du), chunk_size=chunk_size)
+                self.assertEqual(tree.to_pv(), self.pathvalues)
+
+    def test_csv(self):
+        data = 'size,path\n1.5,"a,b/c"\n2,a\n"3",d/"e"\n'
+        with self.assertRaises(ValueError):
+            read_tree(io.StringIO(data), delimiter=",")
+        tree = read_tree(io.StringIO(data.split("\n", 1)[1]), delimiter=",")
+        self.assertEqual(
+            tree.to_pv(),
+            {Path(("a,b", "c")): 1.5, Path(("a",)): 2.0, Path(("d", '"e"')): 3},
+        )
+
+    def test_tsv_quotes(self):
+        tree = read_tree(io.StringIO('1\t"a"/b\n\n2\tc\textra\r\n3\n'))
+        self.assertEqual(
+            tree.to_pv(), {Path(('"a"', "b")): 1.0, Path(("c\textra",)): 2.0}
+        )
+
+    def test_cumulative(self):
+        tree = read_tree(io.StringIO(self.du), cumulative=True)
+        self.assertEqual(
+            tree.to_pv(),
+            {
+                Path((".", "a", "x")): 4.0,
+                Path((".", "a", "y")): 8.0,
+                Path((".", "a")): 4.0,
+                Path((".", "b")): 2.0,
+                Path((".", "c", "d", "z")): 1.0,
+                Path((".", "c", "d")): 2.0,
+                Path((".", "c")): 2.0,
+                Path((".",)): 7.0,
+            },
+        )
+        self.assertEqual(tree.complete().subtree_value[1], 30.0)
+
+    def test_max_depth(self):
+        tree = read_tree(io.StringIO(self.du), max_depth=2)
+        self.assertEqual(tree.max_depth, 2)
+        self.assertEqual(tree.complete().subtree_value[0], 69.0)
+        tree = read_tree(io.StringIO(self.du), cumulative=True, max_depth=2)
+        self.assertEqual(tree.max_depth, 2)
+        self.assertEqual(
+            tree.complete().to_completed_pv(),
+            {
+                Path(()): 30.0,
+                Path((".",)): 30.0,
+                Path((".", "a")): 16.0,
+                Path((".", "b")): 2.0,
+                Path((".", "c")): 5.0,
+            },
+        )
+
+    def test_cumulative_absolute(self):
+        # du -a /usr/share/foo: the directories above foo are not listed
+        du = self.du.replace("\t.", "\t/usr/share/foo")
+        tree = read_tree(io.StringIO(du), cumulative=True)
+        relative = read_tree(io.StringIO(self.du), cumulative=True)
+        prefix = Path(("", "usr", "share", "foo"))
+        self.assertEqual(
+            tree.to_pv(),
+            {
+                prefix + path[1:]: value
+                for path, value in relative.to_pv().items()
+            },
+        )
+        completed = tree.complete().to_completed_pv()
+        for depth in range(4):
+            self.assertEqual(completed[prefix[:depth]], 30.0)
+
+    def test_max_depth_absolute(self):
+        du = self.du.replace("\t.", "\t/usr/share/foo")
+        prefix = Path(("", "usr", "share"))
+        for cumulative in (False, True):
+            with self.subTest(cumulative=cumulative):
+                tree = read_tree(
+                    io.StringIO(du), cumulative=cumulative, max_depth=2
+                )
+                relative = read_tree(
+                    io.StringIO(self.du), cumulative=cumulative, max_depth=2
+                )
+                self.assertEqual(tree.max_depth, 5)
+                completed = relative.complete().to_completed_pv()
+                expected = {
+                    prefix + ("foo",) + path[1:]: value
+                    for path, value in completed.items()
+                    if path
+                }
+                for depth in range(4):
+                    expected[prefix[:depth]] = completed[Path(())]
+                self.assertEqual(tree.complete().to_completed_pv(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
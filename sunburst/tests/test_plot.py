@@ -0,0 +1,489 @@
+import collections
+import math
+import random
+import unittest
+from unittest import mock
+import matplotlib
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from sunburst.path import Path, stringvalues_to_pv
+from sunburst.plot import SunburstPlot
+
+matplotlib.use("AGG")
+
+
+class SunburstPlotTest(unittest.TestCase):
+    def setUp(self):
+        self.pathvalues = stringvalues_to_pv(
+            {
+                "ipsum": 40.45,
+                "ipsum/eirmod": 29.34,
+                "ipsum/eirmod/dolor": 94.4,
+                "lorem": 36.12,
+                "lorem/sadipscing/dolor": 44.32,
+                "lorem/sadipscing/lorem": 37.15,
+                "lorem/sadipscing/nonumy": 23.98,
+                "lorem/eirmod": 11.12,
+                "lorem/eirmod/lorem": 45.65,
+                "lorem/sadipscing": 79.67,
+            }
+        )
+        self.axes = Figure().add_subplot()
+
+    def sbp(self, **kwargs) -> SunburstPlot:
+        sbp = SunburstPlot(self.pathvalues, self.axes, **kwargs)
+        sbp.prepare_data()
+        return sbp
+
+    def test_is_outmost(self):
+        sbp = self.sbp()
+        paths = list(sbp._completed_pv)
+        for path in paths:
+            with self.subTest(path=path):
+                has_descendant = any(
+                    len(other) > len(path) and other.startswith(path)
+                    for other in paths
+                )
+                self.assertEqual(sbp._is_outmost(path), not has_descendant)
+        self.assertTrue(sbp._is_outmost(Path(("ipsum", "eirmod", "dolor"))))
+        self.assertFalse(sbp._is_outmost(Path(())))
+
+    def test_radii(self):
+        def spacing(path: Path):
+            if len(path) == 1:
+                return 0.1, 0.2
+            if path.startswith(Path(("lorem",))):
+                return 0, 0.1
+            return 0, 0
+
+        calls = collections.Counter()  # type: collections.Counter
+
+        class Plot(SunburstPlot):
+            def wedge_width(self, path: Path) -> float:
+                calls[path] += 1
+                return 0.5 if len(path) == 2 else 0.4
+
+            def wedge_spacing(self, path: Path):
+                calls[path] += 1
+                return spacing(path)
+
+        for plot_center in (False, True):
+            with self.subTest(plot_center=plot_center):
+                calls.clear()
+                sbp = Plot(self.pathvalues, self.axes, plot_center=plot_center)
+                sbp.prepare_data()
+                self.assertLessEqual(max(calls.values()), 2)
+                start = 0 if plot_center else 1
+                for path in sbp._completed_pv:
+                    if not path and not plot_center:
+                        # no wedge
+                        continue
+                    inner = (
+                        sum(
+                            sbp.wedge_width(path[:i]) + sum(spacing(path[:i]))
+                            for i in range(start, len(path))
+                        )
+                        + spacing(path)[0]
+                    )
+                    outer = inner + sbp.wedge_width(path)
+                    self.assertAlmostEqual(sbp._wedge_inner_radius(path), inner)
+                    self.assertAlmostEqual(sbp._wedge_outer_radius(path), outer)
+
+    def test_face_colors(self):
+        calls = []
+        cmap = matplotlib.colormaps["viridis"]
+
+        def counting_cmap(*args, **kwargs):
+            calls.append(args)
+            return cmap(*args, **kwargs)
+
+        sbp = self.sbp(cmap=counting_cmap)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sbp.face_color(Path(())), (1, 1, 1, 1))
+        for path, angles in sbp._angles.items():
+            if not path:
+                continue
+            with self.subTest(path=path):
+                color = list(cmap((angles.theta1 + angles.theta2) / 2 / 360))
+                for i in range(3):
+                    color[i] += (1 - color[i]) * 0.7 * len(path) / 4
+                for calculated, expected in zip(sbp.face_color(path), color):
+                    self.assertAlmostEqual(calculated, expected)
+
+    def test_face_color_override(self):
+        class Plot(SunburstPlot):
+            def face_color(self, path):
+                return (0, 0, 1, 1) if path else (1, 0, 0, 1)
+
+        sbp = Plot(self.pathvalues, self.axes)
+        sbp.prepare_data()
+        for wedge in sbp.wedges.values():
+            self.assertEqual(tuple(wedge.get_facecolor()), (0, 0, 1, 1))
+
+    def test_render_collection(self):
+        patches_axes = Figure().add_subplot()
+        SunburstPlot(self.pathvalues, patches_axes).plot(setup_axes=True)
+        sbp = SunburstPlot(self.pathvalues, self.axes)
+        sbp.plot(setup_axes=True, render="collection")
+        self.assertEqual(len(self.axes.patches), 0)
+        self.assertEqual(len(self.axes.collections), 1)
+        self.assertIs(self.axes.collections[0], sbp.collection)
+        self.assertEqual(len(self.axes.texts), len(patches_axes.texts))
+        facecolors = sbp.collection.get_facecolors()
+        self.assertEqual(len(facecolors), len(sbp.wedges))
+        for path, wedge in sbp.wedges.items():
+            with self.subTest(path=path):
+                index = sbp.collection_index[path]
+                self.assertEqual(
+                    tuple(facecolors[index]), tuple(wedge.get_facecolor())
+                )
+        for calculated, expected in zip(
+            self.axes.get_xlim() + self.axes.get_ylim(),
+            patches_axes.get_xlim() + patches_axes.get_ylim(),
+        ):
+            self.assertAlmostEqual(calculated, expected, places=5)
+        with self.assertRaises(ValueError):
+            SunburstPlot(self.pathvalues, self.axes).plot(render="nothing")
+
+    def test_path_at(self):
+        random.seed(4)
+        for plot_center in (False, True):
+            sbp = self.sbp(plot_center=plot_center)
+            for _ in range(2000):
+                radius = random.uniform(0, 1.8)
+                angle = random.uniform(0, 360)
+                x = radius * math.cos(math.radians(angle))
+                y = radius * math.sin(math.radians(angle))
+                expected = [
+                    path
+                    for path, wedge in sbp.wedges.items()
+                    if wedge.r - wedge.width <= radius <= wedge.r
+                    and wedge.theta1 <= angle <= wedge.theta2
+                ]
+                with self.subTest(plot_center=plot_center, x=x, y=y):
+                    self.assertIn(
+                        sbp.path_at(x, y), expected if expected else [None]
+                    )
+            self.assertIsNone(sbp.path_at(2, 0))
+
+    def test_hover(self):
+        for render in ("patches", "collection"):
+            with self.subTest(render=render):
+                axes = Figure().add_subplot()
+                sbp = SunburstPlot(self.pathvalues, axes)
+                sbp.plot(setup_axes=True, interactive=True, render=render)
+                canvas = axes.figure.canvas
+                canvas.draw()
+
+                def move_to(x, y):
+                    display = axes.transData.transform((x, y))
+                    event = MouseEvent("motion_notify_event", canvas, *display)
+                    canvas.callbacks.process("motion_notify_event", event)
+
+                def alpha(path):
+                    if sbp.collection is not None:
+                        index = sbp.collection_index[path]
+                        return sbp.collection.get_facecolor()[index, 3]
+                    return sbp.wedges[path].get_alpha()
+
+                ipsum, lorem = Path(("ipsum",)), Path(("lorem",))
+                move_to(*self._wedge_center(sbp, ipsum))
+                self.assertEqual(alpha(ipsum), 0.5)
+                self.assertEqual(axes.get_title(), sbp.format_text(ipsum))
+                move_to(*self._wedge_center(sbp, lorem))
+                self.assertEqual(alpha(ipsum), 1.0)
+                self.assertEqual(alpha(lorem), 0.5)
+                self.assertEqual(axes.get_title(), sbp.format_text(lorem))
+                # outside of the chart, but inside of the axes
+                move_to(1.25, 1.25)
+                self.assertEqual(alpha(lorem), 1.0)
+
+    def test_hover_blit(self):
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        sbp = SunburstPlot(self.pathvalues, axes)
+        sbp.plot(setup_axes=True, interactive=True, blit=True)
+        canvas = axes.figure.canvas
+        canvas.draw()
+        # the animated artists are not part of the cached background
+        self.assertTrue(sbp.hover_overlay.get_animated())
+        self.assertTrue(sbp.tooltip.get_animated())
+
+        def move_to(x, y):
+            display = axes.transData.transform((x, y))
+            event = MouseEvent("motion_notify_event", canvas, *display)
+            canvas.callbacks.process("motion_notify_event", event)
+
+        path = Path(("ipsum", "eirmod"))
+        with mock.patch.object(canvas, "draw_idle") as draw_idle:
+            with mock.patch.object(canvas, "blit") as blit:
+                move_to(*self._wedge_center(sbp, path))
+                self.assertEqual(blit.call_count, 1)
+            draw_idle.assert_not_called()
+        self.assertTrue(sbp.hover_overlay.get_visible())
+        self.assertEqual(sbp.hover_overlay.theta1, sbp.wedges[path].theta1)
+        self.assertEqual(sbp.hover_overlay.theta2, sbp.wedges[path].theta2)
+        self.assertAlmostEqual(sbp.hover_overlay.r, sbp.wedges[path].r)
+        self.assertAlmostEqual(sbp.hover_overlay.width, sbp.wedges[path].width)
+        self.assertEqual(sbp.tooltip.get_text(), sbp.format_text(path))
+        self.assertTrue(sbp.tooltip.get_visible())
+        # the wedges themselves are not changed
+        self.assertEqual(sbp.wedges[path].get_alpha(), 1)
+        self.assertEqual(axes.get_title(), "")
+        move_to(1.25, 1.25)
+        self.assertFalse(sbp.hover_overlay.get_visible())
+        self.assertFalse(sbp.tooltip.get_visible())
+
+    def test_cull_labels(self):
+        for figsize, dense in [((20, 20), False), ((2, 2), True)]:
+            with self.subTest(figsize=figsize):
+                all_axes = Figure(figsize=figsize).add_subplot()
+                SunburstPlot(self.pathvalues, all_axes).plot()
+                axes = Figure(figsize=figsize).add_subplot()
+                sbp = SunburstPlot(self.pathvalues, axes, cull_labels=True)
+                sbp.plot()
+                texts = [text.get_text() for text in axes.texts]
+                if dense:
+                    self.assertLess(len(texts), len(all_axes.texts))
+                else:
+                    self.assertEqual(len(texts), len(all_axes.texts))
+                # the biggest values are labelled first
+                self.assertIn(sbp.format_text(Path(("lorem",))), texts)
+                self.assertEqual(len(set(texts)), len(texts))
+
+    def test_lazy_labels(self):
+        figure = Figure(figsize=(4, 4))
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        sbp = SunburstPlot(self.pathvalues, axes, label_minimal_size=120)
+        sbp.plot(setup_axes=True, lazy_labels=True)
+        figure.canvas.draw()
+
+        def shown():
+            return {
+                text.get_text() for text in sbp.label_pool if text.get_visible()
+            }
+
+        # only the wedge with the longest arc is big enough
+        overview = shown()
+        self.assertEqual(
+            overview, {sbp.format_text(Path(("lorem", "sadipscing")))}
+        )
+        pool = list(sbp.label_pool)
+        xlim, ylim = axes.get_xlim(), axes.get_ylim()
+        # zoom into the upper left of the chart (the wedges of ipsum)
+        center = self._wedge_center(sbp, Path(("ipsum", "eirmod", "dolor")))
+        axes.set_xlim(center[0] - 0.2, center[0] + 0.2)
+        axes.set_ylim(center[1] - 0.2, center[1] + 0.2)
+        zoomed = shown()
+        self.assertIn(
+            sbp.format_text(Path(("ipsum", "eirmod", "dolor"))), zoomed
+        )
+        self.assertNotIn(sbp.format_text(Path(("lorem", "sadipscing"))), zoomed)
+        self.assertEqual(sbp.label_pool[: len(pool)], pool)
+        # outside of the chart
+        axes.set_xlim(5, 6)
+        self.assertEqual(shown(), set())
+        axes.set_xlim(xlim)
+        axes.set_ylim(ylim)
+        self.assertEqual(shown(), overview)
+        self.assertEqual(len(axes.texts), len(sbp.label_pool))
+
+    @staticmethod
+    def _texts(axes):
+        """Sorted contents, positions and rotations of the texts of
+        `axes`.
+        """
+        return sorted(
+            (
+                text.get_text(),
+                round(text.get_position()[0], 6),
+                round(text.get_position()[1], 6),
+                round(text.get_rotation(), 6),
+            )
+            for text in axes.texts
+        )
+
+    @staticmethod
+    def _wedge_center(sbp: SunburstPlot, path: Path):
+        wedge = sbp.wedges[path]
+        radius = (
+            sbp._wedge_inner_radius(path) + sbp._wedge_outer_radius(path)
+        ) / 2
+        angle = math.radians((wedge.theta1 + wedge.theta2) / 2)
+        return radius * math.cos(angle), radius * math.sin(angle)
+
+    def test_prune(self):
+        # only the first two levels have subtrees with an angle >= 100
+        sbp = self.sbp(prune_minimal_angle=100)
+        self.assertEqual(
+            set(sbp.wedges),
+            set(map(Path, [("ipsum",), ("ipsum", "eirmod"), ("lorem",)]))
+            | {Path(("lorem", "sadipscing"))},
+        )
+        sbp = self.sbp(prune_minimal_angle=100, prune_other="other")
+        self.assertAlmostEqual(
+            sbp._completed_pv[Path(("lorem", "other"))], 56.77
+        )
+        self.assertAlmostEqual(
+            sbp._completed_pv[Path(("lorem", "sadipscing", "other"))], 105.45
+        )
+        self.assertIn(Path(("ipsum", "eirmod", "other")), sbp.wedges)
+        self.assertNotIn(Path(("ipsum", "other")), sbp.wedges)
+        self.assertAlmostEqual(sbp._theta2[0] - sbp._theta1[0], 360)
+
+    def test_max_depth(self):
+        full = self.sbp()
+        for max_depth in (1, 2):
+            with self.subTest(max_depth=max_depth):
+                sbp = self.sbp(max_depth=max_depth)
+                self.assertEqual(sbp._max_level, max_depth)
+                self.assertEqual(
+                    set(sbp.wedges),
+                    {path for path in full.wedges if len(path) <= max_depth},
+                )
+                for path in sbp.wedges:
+                    self.assertAlmostEqual(
+                        sbp._completed_pv[path], full._completed_pv[path]
+                    )
+                    self.assertEqual(
+                        sbp.wedges[path].theta1, full.wedges[path].theta1
+                    )
+                    self.assertEqual(
+                        sbp.wedges[path].theta2, full.wedges[path].theta2
+                    )
+                for path in sbp.wedges:
+                    self.assertEqual(
+                        sbp._is_outmost(path), len(path) == max_depth
+                    )
+
+    def test_update(self):
+        deltas = [
+            # only values
+            stringvalues_to_pv({"ipsum/eirmod/dolor": 10.0, "lorem": 50.0}),
+            # new and removed paths
+            {
+                **stringvalues_to_pv({"dolor/sit": 20.0, "lorem/eirmod": None}),
+                **stringvalues_to_pv({"lorem/eirmod/lorem": None}),
+            },
+        ]
+        for render, cull_labels in [
+            ("patches", False),
+            ("collection", False),
+            ("patches", True),
+        ]:
+            with self.subTest(render=render, cull_labels=cull_labels):
+                axes = Figure().add_subplot()
+                sbp = SunburstPlot(
+                    self.pathvalues, axes, cull_labels=cull_labels
+                )
+                sbp.plot(render=render)
+                expected_pv = dict(self.pathvalues)
+                for delta in deltas:
+                    wedges = dict(sbp.wedges)
+                    sbp.update(delta)
+                    for path, value in delta.items():
+                        if value is None:
+                            del expected_pv[path]
+                        else:
+                            expected_pv[path] = value
+                    expected_axes = Figure().add_subplot()
+                    expected = SunburstPlot(
+                        expected_pv, expected_axes, cull_labels=cull_labels
+                    )
+                    expected.plot(render=render)
+                    self.assertEqual(set(sbp.wedges), set(expected.wedges))
+                    for path, wedge in sbp.wedges.items():
+                        expected_wedge = expected.wedges[path]
+                        self.assertAlmostEqual(
+                            wedge.theta1, expected_wedge.theta1
+                        )
+                        self.assertAlmostEqual(
+                            wedge.theta2, expected_wedge.theta2
+                        )
+                        self.assertEqual(wedge.r, expected_wedge.r)
+                        for component, expected_component in zip(
+                            wedge.get_facecolor(), expected_wedge.get_facecolor()
+                        ):
+                            self.assertAlmostEqual(component, expected_component)
+                        self.assertEqual(
+                            wedge.get_label(), expected_wedge.get_label()
+                        )
+                        # the wedges are modified, not created again
+                        if path in wedges:
+                            self.assertIs(wedge, wedges[path])
+                        self.assertEqual(
+                            sbp.path_at(*self._wedge_center(sbp, path)), path
+                        )
+                    if render == "patches":
+                        self.assertEqual(
+                            set(axes.patches), set(sbp.wedges.values())
+                        )
+                    else:
+                        self.assertEqual(len(axes.collections), 1)
+                        self.assertEqual(
+                            len(sbp.collection.get_paths()), len(sbp.wedges)
+                        )
+                        for path, index in sbp.collection_index.items():
+                            self.assertTrue(
+                                (
+                                    sbp.collection.get_paths()[index].vertices
+                                    == sbp.wedges[path].get_path().vertices
+                                ).all()
+                            )
+                    # the annotations are updated as well
+                    self.assertEqual(
+                        self._texts(axes), self._texts(expected_axes)
+                    )
+                    self.assertEqual(sbp.input_pv.to_pv(), expected_pv)
+        with self.assertRaises(ValueError):
+            self.sbp(prune_minimal_angle=10).update(deltas[0])
+
+    def test_stats(self):
+        with mock.patch.dict("os.environ", {"SUNBURST_STATS": ""}):
+            self.assertFalse(self.sbp().stats.enabled)
+            self.assertEqual(self.sbp().stats.counters, {})
+        with mock.patch.dict("os.environ", {"SUNBURST_STATS": "1"}):
+            self.assertTrue(self.sbp().stats.enabled)
+            self.assertFalse(self.sbp(stats=False).stats.enabled)
+        sbp = SunburstPlot(
+            self.pathvalues,
+            self.axes,
+            stats=True,
+            plot_minimal_angle=20,
+            label_minimal_angle=40,
+        )
+        sbp.format_path_text = lambda path: "x"  # type: ignore
+        sbp.plot(setup_axes=True)
+        counters = sbp.stats.counters
+        self.assertEqual(counters["input_nodes"], 10)
+        self.assertEqual(counters["completed_nodes"], 11)
+        self.assertEqual(counters["wedges_created"], len(sbp.wedges))
+        self.assertEqual(
+            counters["wedges_skipped"], 10 - counters["wedges_created"]
+        )
+        n_small = sum(
+            1
+            for path in sbp.wedges
+            if sbp.wedges[path].theta2 - sbp.wedges[path].theta1 <= 40
+        )
+        self.assertGreater(n_small, 0)
+        self.assertEqual(counters["labels_skipped_angle"], n_small)
+        self.assertEqual(counters["labels_created"], len(sbp.wedges) - n_small)
+        self.assertEqual(counters["calls:wedge_width"], 10)
+        self.assertEqual(counters["calls:face_color"], len(sbp.wedges))
+        # replaced on the instance before plot
+        self.assertEqual(
+            counters["calls:format_path_text"], counters["calls:format_text"]
+        )
+        self.assertEqual(
+            {"tree", "ordering", "angles", "wedges", "labels", "setup_axes"}
+            - set(sbp.stats.durations),
+            set(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
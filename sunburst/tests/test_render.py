@@ -0,0 +1,77 @@
+import concurrent.futures
+import re
+import unittest
+from sunburst.path import stringvalues_to_pv
+from sunburst.plot import SunburstPlot
+from sunburst.render import plot_figure, render_bytes
+
+
+class RenderTest(unittest.TestCase):
+    def setUp(self):
+        self.snapshots = [
+            stringvalues_to_pv(
+                {"a": 1.0 + i, "a/x": 2.0, "b": 3.0 * i, "b/y/z": 1.5}
+            )
+            for i in range(4)
+        ]
+
+    @staticmethod
+    def render(pathvalues, image_format):
+        image = render_bytes(
+            pathvalues,
+            image_format,
+            figsize=(3, 3),
+            savefig_kwargs=(
+                {"metadata": {"Date": None}} if image_format == "svg" else None
+            ),
+            plot_center=True,
+        )
+        if image_format == "svg":
+            # the ids of the clip paths are random
+            image = re.sub(rb"p[0-9a-f]{10}", b"", image)
+        return image
+
+    def test_plot_figure(self):
+        class Plot(SunburstPlot):
+            pass
+
+        sbp = plot_figure(
+            self.snapshots[1], figsize=(4, 3), dpi=50, plot_class=Plot
+        )
+        self.assertIsInstance(sbp, Plot)
+        self.assertEqual(
+            tuple(sbp.axes.figure.canvas.get_width_height()), (200, 150)
+        )
+        self.assertEqual(len(sbp.axes.patches), len(sbp.wedges))
+
+    def test_render_bytes(self):
+        png = self.render(self.snapshots[1], "png")
+        self.assertTrue(png.startswith(b"\x89PNG\r\n\x1a\n"))
+        svg = self.render(self.snapshots[1], "svg")
+        self.assertIn(b"<svg", svg)
+        # the labels
+        self.assertIn(b"<!-- a (4.00) -->", svg)
+        self.assertIn(b"<!-- x (2.00) -->", svg)
+
+    def test_threads(self):
+        for image_format in ("png", "svg"):
+            with self.subTest(image_format=image_format):
+                expected = [
+                    self.render(pathvalues, image_format)
+                    for pathvalues in self.snapshots
+                ]
+                with concurrent.futures.ThreadPoolExecutor(8) as executor:
+                    images = list(
+                        executor.map(
+                            lambda i: self.render(
+                                self.snapshots[i % 4], image_format
+                            ),
+                            range(32),
+                        )
+                    )
+                for i, image in enumerate(images):
+                    self.assertEqual(image, expected[i % 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sunburst.path import Path
+from sunburst.scan import scan
+
+
+class ScanTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = os.path.join(self.tmp_dir.name, "root")
+        self.files = {
+            "a.txt": 100,
+            "sub/b.txt": 20,
+            "sub/c.log": 3,
+            "sub/deep/d.txt": 4000,
+            "sub/deep/deeper/e.txt": 5,
+            "other/f.txt": 60,
+        }
+        for name, size in self.files.items():
+            path = os.path.join(self.root, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"x" * size)
+        os.makedirs(os.path.join(self.root, "empty"))
+        self.dir_size = os.stat(self.root).st_size
+
+    def files_size(self, prefix: str = "") -> int:
+        return sum(
+            size for name, size in self.files.items() if name.startswith(prefix)
+        )
+
+    def test_scan(self):
+        for workers in (1, 4):
+            with self.subTest(workers=workers):
+                tree = scan(self.root, workers=workers)
+                completed = tree.to_completed_pv()
+                self.assertEqual(
+                    set(completed),
+                    {Path(()), Path(("root",))}
+                    | {
+                        Path(("root",) + tuple(d.split("/")))
+                        for d in ["sub", "sub/deep", "sub/deep/deeper"]
+                        + ["other", "empty"]
+                    },
+                )
+                # directory sizes depend on the file system
+                dirs = {
+                    path: os.stat(os.path.join(self.tmp_dir.name, *path)).st_size
+                    for path in completed
+                    if path
+                }
+                for path, value in completed.items():
+                    if not path:
+                        continue
+                    prefix = "/".join(path[1:])
+                    expected = self.files_size(prefix + "/" if prefix else "")
+                    expected += sum(
+                        size
+                        for other, size in dirs.items()
+                        if other[: len(path)] == path
+                    )
+                    self.assertEqual(value, expected, path)
+                self.assertEqual(
+                    tree.to_pv()[Path(("root",))],
+                    self.files["a.txt"] + self.dir_size,
+                )
+
+    def test_exclude(self):
+        tree = scan(self.root, exclude=["*.txt", os.path.join(self.root, "em*")])
+        completed = tree.to_completed_pv()
+        self.assertNotIn(Path(("root", "empty")), completed)
+        self.assertIn(Path(("root", "sub", "deep")), completed)
+        total = completed[Path(("root",))]
+        self.assertEqual(
+            total,
+            scan(self.root).subtree_value[0]
+            - self.files_size()
+            + 3
+            - os.stat(os.path.join(self.root, "empty")).st_size,
+        )
+
+    def test_max_depth(self):
+        full = scan(self.root).to_completed_pv()
+        tree = scan(self.root, max_depth=2)
+        self.assertEqual(tree.max_depth, 2)
+        self.assertEqual(
+            tree.to_completed_pv(),
+            {path: value for path, value in full.items() if len(path) <= 2},
+        )
+        with self.assertRaises(ValueError):
+            scan(self.root, max_depth=0)
+
+    def test_allocated_size(self):
+        tree = scan(self.root, apparent_size=False)
+        self.assertGreater(tree.subtree_value[0], 0)
+        self.assertEqual(len(tree), len(scan(self.root)))
+
+    @unittest.skipUnless(hasattr(os, "link"), "hard links not supported")
+    def test_hardlinks(self):
+        before = scan(self.root).subtree_value[0]
+        os.link(
+            os.path.join(self.root, "a.txt"),
+            os.path.join(self.root, "other", "a_link.txt"),
+        )
+        self.assertEqual(scan(self.root).subtree_value[0], before)
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_symlinks(self):
+        try:
+            os.symlink(self.root, os.path.join(self.root, "sub", "loop"))
+            os.symlink(
+                os.path.join(self.root, "sub", "deep"),
+                os.path.join(self.root, "link"),
+            )
+        except OSError:
+            self.skipTest("symlinks not supported")
+        completed = scan(self.root).to_completed_pv()
+        self.assertNotIn(Path(("root", "link")), completed)
+        self.assertNotIn(Path(("root", "sub", "loop")), completed)
+        followed = scan(self.root, follow_symlinks=True).to_completed_pv()
+        # every directory is only visited once: the directories are scanned
+        # breadth first, so deep is found as link (before sub/deep)
+        self.assertEqual(len(followed), len(completed))
+        self.assertNotIn(Path(("root", "sub", "loop")), followed)
+        self.assertNotIn(Path(("root", "sub", "deep")), followed)
+        self.assertEqual(
+            followed[Path(("root", "link"))],
+            completed[Path(("root", "sub", "deep"))],
+        )
+
+    def test_cache(self):
+        cache = os.path.join(self.tmp_dir.name, "cache.json")
+        # directories modified right before a scan are not cached
+        for directory, _, _ in os.walk(self.root):
+            os.utime(directory, (1e9, 1e9))
+        expected = scan(self.root).to_completed_pv()
+
+        def scanned_dirs(**kwargs):
+            with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+                tree = scan(self.root, cache=cache, **kwargs)
+            return tree.to_completed_pv(), scandir.call_count
+
+        self.assertEqual(scanned_dirs(), (expected, 6))
+        self.assertEqual(scanned_dirs(), (expected, 0))
+        self.assertEqual(scanned_dirs(workers=1), (expected, 0))
+        # other options invalidate the cache
+        self.assertEqual(scanned_dirs(exclude=["*.log"])[1], 6)
+        self.assertEqual(scanned_dirs(exclude=["*.log"])[1], 0)
+        self.assertEqual(scanned_dirs()[1], 6)
+
+        with open(os.path.join(self.root, "sub", "deep", "g.txt"), "wb") as f:
+            f.write(b"x" * 7)
+        completed, count = scanned_dirs()
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            completed[Path(("root",))], expected[Path(("root",))] + 7
+        )
+        self.assertEqual(completed, scan(self.root).to_completed_pv())
+        # sub/deep was modified too recently to be cached
+        self.assertEqual(scanned_dirs()[1], 1)
+
+        # removed directories are not visited
+        os.remove(os.path.join(self.root, "other", "f.txt"))
+        os.rmdir(os.path.join(self.root, "other"))
+        os.utime(self.root, (1e9, 1e9))
+        completed = scanned_dirs()[0]
+        self.assertNotIn(Path(("root", "other")), completed)
+        self.assertEqual(completed, scan(self.root).to_completed_pv())
+
+    def test_onerror(self):
+        errors = []
+        scan(os.path.join(self.root, "a.txt"), onerror=errors.append)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], NotADirectoryError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import tracemalloc
+import unittest
+from unittest import mock
+from sunburst.stats import NullStats, Stats, make_stats
+
+
+class StatsTest(unittest.TestCase):
+    def test_stats(self):
+        stats = Stats()
+        with stats.timer("a"):
+            pass
+        with stats.timer("b"):
+            pass
+        with stats.timer("a"):
+            stats.count("x")
+            stats.count("x", 2)
+        self.assertEqual(list(stats.durations), ["a", "b"])
+        self.assertGreaterEqual(stats.durations["a"], 0)
+        self.assertEqual(stats.counters, {"x": 3})
+        function = stats.counting(lambda value: 2 * value, "calls")
+        self.assertEqual(function(2), 4)
+        self.assertEqual(stats.counters["calls"], 1)
+        self.assertEqual(stats.as_dict()["counters"], {"x": 3, "calls": 1})
+        self.assertIn("calls", str(stats))
+        stats.reset()
+        self.assertEqual(stats.as_dict(), {"durations": {}, "counters": {}})
+
+    @unittest.skipIf(sys.version_info < (3, 9), "needs tracemalloc.reset_peak")
+    def test_memory(self):
+        stats = Stats()
+        with stats.timer("untraced"):
+            pass
+        self.assertEqual(stats.memory, {})
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        with stats.timer("small"):
+            pass
+        with stats.timer("large"):
+            data = bytearray(10**6)
+            del data
+        self.assertEqual(list(stats.memory), ["small", "large"])
+        self.assertLess(stats.memory["small"], 10**5)
+        self.assertGreaterEqual(stats.memory["large"], 10**6)
+        self.assertEqual(stats.as_dict()["memory"], stats.memory)
+        self.assertIn("Memory peaks:", str(stats))
+        stats.reset()
+        self.assertEqual(stats.memory, {})
+
+    def test_null_stats(self):
+        stats = NullStats()
+        with stats.timer("a"):
+            stats.count("x")
+
+        def function():
+            pass
+
+        self.assertIs(stats.counting(function, "calls"), function)
+        self.assertEqual(stats.as_dict(), {"durations": {}, "counters": {}})
+        self.assertEqual(str(stats), "")
+
+    def test_make_stats(self):
+        for value, enabled in [
+            ("", False),
+            ("0", False),
+            ("off", False),
+            ("1", True),
+            ("yes", True),
+        ]:
+            with self.subTest(value=value):
+                with mock.patch.dict("os.environ", {"SUNBURST_STATS": value}):
+                    self.assertEqual(make_stats().enabled, enabled)
+                    self.assertTrue(make_stats(True).enabled)
+                    self.assertFalse(make_stats(False).enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
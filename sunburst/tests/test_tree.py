@@ -0,0 +1,181 @@
+import unittest
+from sunburst.path import Path, charvalues_to_pv, stringvalues_to_pv
+from sunburst.calc import (
+    complete_pv,
+    complete_paths,
+    structure_paths,
+    calculate_angles,
+)
+from sunburst.tree import PathTree, PathTreeBuilder
+
+
+class PathTreeTest(unittest.TestCase):
+    def setUp(self):
+        self.pathvalues = charvalues_to_pv(
+            {
+                "1": 5.0,
+                "111": 92.0,
+                "1111": 15.0,
+                "1112": 99.0,
+                "112": 0.0,
+                "1121": 70.0,
+                "113": 27.0,
+                "12": 51.0,
+                "121": 43.0,
+                "122": 29.0,
+                "13": 69.0,
+                "2": 29.0,
+                "211": 43.0,
+            }
+        )
+        self.tree = PathTree.from_pv(self.pathvalues)
+
+    def test_structure(self):
+        self.assertEqual(len(self.tree), 16)
+        self.assertEqual(self.tree.parent[0], -1)
+        self.assertEqual(self.tree.max_depth, 4)
+        self.assertEqual(sorted(self.tree.components), ["1", "2", "3"])
+        for node, path in enumerate(self.tree.paths()):
+            with self.subTest(path=path):
+                self.assertEqual(self.tree.depth[node], len(path))
+                self.assertEqual(self.tree.path(node), path)
+                if node:
+                    self.assertLess(self.tree.parent[node], node)
+                    self.assertEqual(
+                        self.tree.path(self.tree.parent[node]), path.parent()
+                    )
+
+    def test_roundtrip(self):
+        pv = self.tree.to_pv()
+        self.assertEqual(pv, self.pathvalues)
+        self.assertEqual(list(pv), list(self.pathvalues))
+
+    def test_complete(self):
+        self.assertFalse(self.tree.completed)
+        completed = complete_pv(self.tree)
+        self.assertIsInstance(completed, PathTree)
+        expected = complete_pv(self.pathvalues)
+        calculated = completed.to_completed_pv()
+        self.assertEqual(set(calculated), set(expected))
+        for path, value in expected.items():
+            with self.subTest(path=path):
+                self.assertAlmostEqual(calculated[path], value)
+
+    def test_max_depth(self):
+        truncated = PathTree.from_pv(self.pathvalues, max_depth=2)
+        self.assertEqual(truncated.max_depth, 2)
+        self.assertEqual(len(truncated), 7)
+        self.assertEqual(
+            truncated.to_pv(),
+            charvalues_to_pv(
+                {
+                    "1": 5.0,
+                    "11": 303.0,
+                    "12": 123.0,
+                    "13": 69.0,
+                    "2": 29.0,
+                    "21": 43.0,
+                }
+            ),
+        )
+        # the ancestors are part of the input in the order of their
+        # first descendant
+        self.assertEqual(
+            list(truncated.to_pv()),
+            [Path(p) for p in ["1", "11", "12", "13", "2", "21"]],
+        )
+
+    def test_truncate(self):
+        for max_depth in range(5):
+            with self.subTest(max_depth=max_depth):
+                expected = PathTree.from_pv(self.pathvalues, max_depth)
+                truncated = self.tree.truncate(max_depth)
+                self.assertEqual(truncated.to_pv(), expected.to_pv())
+                self.assertEqual(list(truncated.to_pv()), list(expected.to_pv()))
+                self.assertEqual(truncated.paths(), expected.paths())
+        completed = complete_pv(self.tree)
+        truncated = completed.truncate(1)
+        self.assertEqual(
+            truncated.to_completed_pv(),
+            {Path(()): 572.0, Path("1"): 500.0, Path("2"): 72.0},
+        )
+        with self.assertRaises(ValueError):
+            self.tree.truncate(-1)
+
+    def test_update(self):
+        delta = charvalues_to_pv(
+            {"111": 1.0, "2": None, "211": None, "1121": None, "31": 3.0}
+        )
+        delta[Path(("1", "1", "3", "4"))] = 4.0
+        delta[Path(("4",))] = None
+        expected = dict(self.pathvalues)
+        for path, value in delta.items():
+            if value is None:
+                expected.pop(path, None)
+            else:
+                expected[path] = value
+        completed = self.tree.complete()
+        updated, old_id = completed.update(delta)
+        self.assertEqual(updated.to_pv(), expected)
+        self.assertEqual(list(updated.to_pv()), list(expected))
+        self.assertEqual(updated.to_completed_pv(), complete_pv(expected))
+        # 112 is part of the input, 2 was removed together with its child
+        self.assertIn(Path(("1", "1", "2")), updated.node_index())
+        self.assertNotIn(Path(("2",)), updated.node_index())
+        self.assertEqual(
+            updated.node_index(),
+            {path: node for node, path in enumerate(updated.paths())},
+        )
+        # the paths that were carried over are the same as computed ones
+        self.assertEqual(
+            updated.paths(), updated.select(updated.depth >= 0).paths()
+        )
+        for node, old in enumerate(old_id.tolist()):
+            if old >= 0:
+                self.assertEqual(updated.path(node), completed.path(old))
+        self.assertEqual(completed.to_pv(), self.pathvalues)
+        # uncompleted trees stay uncompleted
+        self.assertFalse(
+            PathTree.from_pv(self.pathvalues).update(delta)[0].completed
+        )
+        with self.assertRaises(ValueError):
+            self.tree.update({Path(()): 1.0})
+
+    def test_empty_path(self):
+        with self.assertRaises(ValueError):
+            PathTree.from_pv({Path(()): 1.0})
+
+    def test_calc_functions(self):
+        tree = complete_pv(self.tree)
+        self.assertEqual(
+            complete_paths(tree), complete_paths(list(self.pathvalues))
+        )
+        structured = structure_paths(tree)
+        self.assertEqual(
+            structured, structure_paths(list(complete_pv(self.pathvalues)))
+        )
+        self.assertEqual(
+            calculate_angles(structured, tree),
+            calculate_angles(structured, complete_pv(self.pathvalues)),
+        )
+
+
+class PathTreeBuilderTest(unittest.TestCase):
+    def test_add(self):
+        builder = PathTreeBuilder()
+        node = builder.add(("a", "b"), 1.0)
+        self.assertEqual(builder.add(["a", "b"], 2.0), node)
+        builder.add(("a",), 3.0)
+        builder.add(("b", "a"), 4.0)
+        tree = builder.build().complete()
+        self.assertEqual(len(tree), 5)
+        self.assertEqual(len(tree.components), 2)
+        self.assertEqual(
+            tree.to_pv(),
+            stringvalues_to_pv({"a/b": 3.0, "a": 3.0, "b/a": 4.0}),
+        )
+        self.assertEqual(tree.subtree_value[0], 10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
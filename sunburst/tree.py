@@ -0,0 +1,557 @@
+from typing import List, Dict, Iterable, Optional, Tuple, cast
+import numpy as np
+from sunburst.path import Path
+
+
+class PathTree(object):
+    """Array based representation of a set of paths and their values.
+
+    Instead of one :class:`~sunburst.path.Path` object per node, the tree is
+    stored as parallel NumPy arrays that are indexed by a node id. Node 0 is
+    always the root (the empty path). Every node is stored after its parent,
+    i.e. ``parent[i] < i`` for all nodes but the root, so that the nodes can
+    be processed top down (or bottom up) by iterating over the indices.
+    Path components are interned: the :py:attr:`component` array only holds
+    ids into the :py:attr:`components` table.
+
+    Usually a tree is built from a pathvalue dictionary with
+    :py:meth:`.from_pv` or incrementally with a :class:`PathTreeBuilder`.
+
+    Attributes:
+        parent: Index of the parent node (-1 for the root)
+        depth: Length of the path corresponding to the node
+        component: Id of the last component of the path in
+            :py:attr:`components` (-1 for the root)
+        value: Value that was assigned to the path itself
+        subtree_value: Value of the path plus the values of all of its
+            descendants (only meaningful after :py:meth:`.complete`)
+        input_order: Position of the path in the input data or -1 if the
+            path was only added as an ancestor of another path
+        components: Table of all distinct path components
+    """
+
+    def __init__(
+        self,
+        parent: np.ndarray,
+        depth: np.ndarray,
+        component: np.ndarray,
+        value: np.ndarray,
+        input_order: np.ndarray,
+        components: List[str],
+        subtree_value: Optional[np.ndarray] = None,
+    ):
+        self.parent = parent
+        self.depth = depth
+        self.component = component
+        self.value = value
+        self.input_order = input_order
+        self.components = components
+        self.subtree_value = subtree_value
+        self._paths = None  # type: Optional[List[Path]]
+        self._node_index = None  # type: Optional[Dict[Path, int]]
+        self._levels = None  # type: Optional[List[np.ndarray]]
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def __repr__(self) -> str:
+        return "PathTree(<{} nodes, {} components>)".format(
+            len(self), len(self.components)
+        )
+
+    @property
+    def completed(self) -> bool:
+        """True if the :py:attr:`subtree_value` has been computed."""
+        return self.subtree_value is not None
+
+    @property
+    def max_depth(self) -> int:
+        """Length of the longest path in the tree."""
+        return int(self.depth.max())
+
+    # *** Conversion ***                                                (emph)
+
+    @classmethod
+    def from_pv(
+        cls, pathvalues: Dict[Path, float], max_depth: Optional[int] = None
+    ) -> "PathTree":
+        """Builds a tree from a pathvalue dictionary of the form
+        Dict[Path, float]. Missing ancestors are added with value 0.
+        The empty path is not allowed as a key (see
+        :func:`sunburst.calc.complete_pv`).
+        If `max_depth` is given, the value of every path that is longer
+        than `max_depth` is added to its ancestor at depth `max_depth`
+        instead (without creating any nodes below).
+        """
+        builder = PathTreeBuilder()
+        # node ids of the paths we have seen so far: usually the parent of
+        # a path is part of the input as well, so we can resolve it with
+        # one lookup instead of walking down all components.
+        nodes = {Path(()): 0}  # type: Dict[Tuple[str, ...], int]
+        for path, value in pathvalues.items():
+            if not path:
+                raise ValueError(
+                    "PathTree does not allow the empty path as item"
+                    "in the data list."
+                )
+            if max_depth is not None and len(path) > max_depth:
+                builder.add(tuple.__getitem__(path, slice(max_depth)), value)
+                continue
+            parent = nodes.get(tuple.__getitem__(path, slice(None, -1)))
+            if parent is None:
+                node = builder.add(path, value)
+            else:
+                node = builder.add_child(
+                    parent, tuple.__getitem__(path, -1), value
+                )
+            nodes[path] = node
+        tree = builder.build()
+        paths = [None] * len(tree)  # type: List[Optional[Path]]
+        for known_path, node in nodes.items():
+            paths[node] = cast(Path, known_path)
+        tree._paths = tree._complete_paths(paths)
+        return tree
+
+    def to_pv(self) -> Dict[Path, float]:
+        """Returns the pathvalue dictionary that the tree was built from,
+        i.e. only paths that were part of the input, in input order.
+        """
+        paths = self.paths()
+        return {paths[i]: float(self.value[i]) for i in self.input_nodes()}
+
+    def to_completed_pv(self) -> Dict[Path, float]:
+        """Returns the pathvalue dictionary of all nodes (including the
+        empty path) with their subtree values, i.e. the equivalent of
+        :func:`sunburst.calc.complete_pv`.
+        """
+        if self.subtree_value is None:
+            raise ValueError("Tree has not been completed yet.")
+        return dict(zip(self.paths(), self.subtree_value.tolist()))
+
+    # *** Access ***                                                    (emph)
+
+    def path(self, node: int) -> Path:
+        """Returns the :class:`~sunburst.path.Path` of a single node."""
+        if self._paths is not None:
+            return self._paths[node]
+        components = []
+        while node > 0:
+            components.append(self.components[self.component[node]])
+            node = self.parent[node]
+        return Path(reversed(components))
+
+    def paths(self) -> List[Path]:
+        """Returns the :class:`~sunburst.path.Path` of every node (indexed
+        by node id). The result is cached.
+        """
+        if self._paths is None:
+            self._paths = self._complete_paths([None] * len(self))
+        return self._paths
+
+    def _complete_paths(self, paths: List[Optional[Path]]) -> List[Path]:
+        """Fills in the missing (None) entries of a list of paths indexed by
+        node id.
+        """
+        paths[0] = Path(())
+        parents = self.parent.tolist()
+        component_ids = self.component.tolist()
+        for node in range(1, len(self)):
+            if paths[node] is None:
+                # the components are known to be strings, so we can skip
+                # the checks of Path.__new__
+                paths[node] = tuple.__new__(
+                    Path,
+                    paths[parents[node]]
+                    + (self.components[component_ids[node]],),
+                )
+        return paths  # type: ignore
+
+    def node_index(self) -> Dict[Path, int]:
+        """Returns a dictionary mapping each path to its node id. The result
+        is cached.
+        """
+        if self._node_index is None:
+            self._node_index = {
+                path: node for node, path in enumerate(self.paths())
+            }
+        return self._node_index
+
+    def n_children(self) -> np.ndarray:
+        """Returns the number of children of every node."""
+        return np.bincount(self.parent[1:], minlength=len(self))
+
+    def input_nodes(self) -> np.ndarray:
+        """Returns the ids of the nodes that were part of the input data,
+        in input order.
+        """
+        nodes = np.flatnonzero(self.input_order >= 0)
+        return nodes[np.argsort(self.input_order[nodes], kind="stable")]
+
+    def levels(self) -> List[np.ndarray]:
+        """Returns the node ids grouped by depth, i.e. the i-th entry holds
+        the (ascending) ids of all nodes with depth i. The result is cached.
+        """
+        if self._levels is None:
+            by_depth = np.argsort(self.depth, kind="stable")
+            counts = np.bincount(self.depth)
+            self._levels = np.split(by_depth, np.cumsum(counts)[:-1])
+        return self._levels
+
+    # *** Modification ***                                              (emph)
+
+    def select(self, mask: np.ndarray) -> "PathTree":
+        """Returns a new tree consisting only of the nodes for which `mask`
+        is True. The root and the parents of all selected nodes must be
+        selected as well. Node ids change, the order of the nodes is kept.
+        """
+        nodes = np.flatnonzero(mask)
+        if not len(nodes) or nodes[0] != 0:
+            raise ValueError("The root node must be selected.")
+        new_id = np.full(len(self), -1, dtype=np.int64)
+        new_id[nodes] = np.arange(len(nodes))
+        parent = new_id[self.parent[nodes]]
+        parent[0] = -1
+        if (parent[1:] < 0).any():
+            raise ValueError("The parents of all nodes must be selected.")
+        return PathTree(
+            parent=parent,
+            depth=self.depth[nodes],
+            component=self.component[nodes],
+            value=self.value[nodes],
+            input_order=self.input_order[nodes],
+            components=self.components,
+            subtree_value=(
+                None if self.subtree_value is None else self.subtree_value[nodes]
+            ),
+        )
+
+    def truncate(self, max_depth: int) -> "PathTree":
+        """Returns a new tree without the nodes deeper than `max_depth`.
+        Their values are added to their ancestor at depth `max_depth`,
+        so that the subtree values of the remaining nodes do not change.
+        Such an ancestor counts as part of the input data from the
+        position of its first removed descendant on (if it was not
+        part of the input before).
+        """
+        if max_depth < 0:
+            raise ValueError("max_depth must not be negative.")
+        levels = self.levels()
+        if max_depth >= len(levels) - 1:
+            return self
+        value = self.value.copy()
+        input_order = self.input_order.copy()
+        # ancestor at depth max_depth of all deeper nodes, level by level
+        ancestor = np.arange(len(self))
+        deep = np.concatenate(levels[max_depth + 1 :])
+        for nodes in levels[max_depth + 1 :]:
+            ancestor[nodes] = ancestor[self.parent[nodes]]
+        np.add.at(value, ancestor[deep], self.value[deep])
+        # nodes that were only ancestors in the input, but now carry
+        # the values of their descendants become part of the input
+        orders = self.input_order[deep]
+        is_input = orders >= 0
+        first_order = np.full(len(self), np.iinfo(np.int64).max)
+        np.minimum.at(first_order, ancestor[deep][is_input], orders[is_input])
+        implied = (input_order < 0) & (first_order < np.iinfo(np.int64).max)
+        input_order[implied] = first_order[implied]
+        truncated = PathTree(
+            parent=self.parent,
+            depth=self.depth,
+            component=self.component,
+            value=value,
+            input_order=input_order,
+            components=self.components,
+            subtree_value=self.subtree_value,
+        )
+        return truncated.select(self.depth <= max_depth)
+
+    def add_leaves(
+        self, parents: np.ndarray, names: List[str], values: np.ndarray
+    ) -> "PathTree":
+        """Returns a new tree with additional leaf nodes, the i-th one being
+        a child named ``names[i]`` of the node ``parents[i]`` with value
+        ``values[i]``. The new nodes count as part of the input data and
+        come after all other paths in input order. The subtree values of
+        the existing nodes are not changed.
+        """
+        components = list(self.components)
+        component_ids = {name: cid for cid, name in enumerate(components)}
+        component = []
+        for name in names:
+            if name not in component_ids:
+                component_ids[name] = len(components)
+                components.append(name)
+            component.append(component_ids[name])
+        parents = np.asarray(parents, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        first_input = self.input_order.max() + 1
+        return PathTree(
+            parent=np.concatenate((self.parent, parents)),
+            depth=np.concatenate((self.depth, self.depth[parents] + 1)),
+            component=np.concatenate(
+                (self.component, np.array(component, dtype=np.int64))
+            ),
+            value=np.concatenate((self.value, values)),
+            input_order=np.concatenate(
+                (
+                    self.input_order,
+                    np.arange(first_input, first_input + len(parents)),
+                )
+            ),
+            components=components,
+            subtree_value=(
+                None
+                if self.subtree_value is None
+                else np.concatenate((self.subtree_value, values))
+            ),
+        )
+
+    def update(
+        self, pathvalues: Dict[Path, Optional[float]]
+    ) -> Tuple["PathTree", np.ndarray]:
+        """Returns a new tree in which the values of the paths in
+        `pathvalues` are replaced by the given values. Paths that are not
+        part of the tree yet are added (after all other paths in input
+        order, missing ancestors are added with value 0), paths with the
+        value None are removed from the input data. The node of a removed
+        path is dropped if it has no descendants left, together with its
+        ancestors that were only added because of it.
+
+        If the tree is completed, the subtree values are updated by adding
+        the difference of each value to the subtree values of the node and
+        its ancestors only, instead of completing the whole tree again.
+
+        Returns:
+            The new tree and the node id (in this tree) of every node of
+            the new tree (-1 for the nodes that were added).
+        """
+        index = self.node_index()
+        # 1. add the nodes for the new paths (and their missing ancestors)
+        # without a value, the values are set below for all paths alike
+        components = self.components
+        component_ids = None  # type: Optional[Dict[str, int]]
+        new_paths = []  # type: List[Path]
+        new_nodes = {}  # type: Dict[Path, int]
+        new_parent = []  # type: List[int]
+        new_component = []  # type: List[int]
+        for path, new_value in pathvalues.items():
+            if not path:
+                raise ValueError(
+                    "PathTree does not allow the empty path as item"
+                    "in the data list."
+                )
+            if new_value is None or path in index or path in new_nodes:
+                continue
+            if component_ids is None:
+                components = list(components)
+                component_ids = {
+                    name: cid for cid, name in enumerate(components)
+                }
+            # the longest prefix of path that has a node already
+            depth = len(path) - 1
+            while depth and path[:depth] not in index:
+                if path[:depth] in new_nodes:
+                    break
+                depth -= 1
+            prefix = path[:depth]
+            node = index[prefix] if prefix in index else new_nodes[prefix]
+            for depth in range(depth + 1, len(path) + 1):
+                name = tuple.__getitem__(path, depth - 1)
+                if name not in component_ids:
+                    component_ids[name] = len(components)
+                    components.append(name)
+                new_parent.append(node)
+                new_component.append(component_ids[name])
+                node = len(self) + len(new_paths)
+                new_paths.append(path[:depth])
+                new_nodes[new_paths[-1]] = node
+
+        n_new = len(new_paths)
+        parent = np.concatenate(
+            (self.parent, np.array(new_parent, dtype=np.int64))
+        )
+        value = np.concatenate((self.value, np.zeros(n_new)))
+        input_order = np.concatenate(
+            (self.input_order, np.full(n_new, -1, dtype=np.int64))
+        )
+        subtree_value = None
+        if self.subtree_value is not None:
+            subtree_value = np.concatenate((self.subtree_value, np.zeros(n_new)))
+        next_input = int(self.input_order.max()) + 1
+
+        # 2. set the values and propagate the differences to the ancestors
+        removed = []  # type: List[int]
+        for path, new_value in pathvalues.items():
+            node = index.get(path, new_nodes.get(path, -1))
+            if node < 0:
+                # removing a path that does not exist
+                continue
+            if new_value is None:
+                difference = -value[node]
+                value[node] = 0
+                input_order[node] = -1
+                removed.append(node)
+            else:
+                difference = new_value - value[node]
+                value[node] = new_value
+                if input_order[node] < 0:
+                    input_order[node] = next_input
+                    next_input += 1
+            if subtree_value is not None and difference:
+                while node >= 0:
+                    subtree_value[node] += difference
+                    node = parent[node]
+
+        tree = PathTree(
+            parent=parent,
+            depth=np.concatenate(
+                (
+                    self.depth,
+                    np.array([len(p) for p in new_paths], dtype=np.int32),
+                )
+            ),
+            component=np.concatenate(
+                (self.component, np.array(new_component, dtype=np.int64))
+            ),
+            value=value,
+            input_order=input_order,
+            components=components,
+            subtree_value=subtree_value,
+        )
+        paths = self.paths() + new_paths
+        old_id = np.concatenate(
+            (np.arange(len(self)), np.full(n_new, -1, dtype=np.int64))
+        )
+        if removed:
+            # 3. drop the nodes that are not part of the input anymore and
+            # have no descendants, bottom up
+            n_children = tree.n_children()
+            keep = np.ones(len(tree), dtype=bool)
+            for node in removed:
+                while (
+                    node > 0
+                    and keep[node]
+                    and not n_children[node]
+                    and input_order[node] < 0
+                ):
+                    keep[node] = False
+                    node = parent[node]
+                    n_children[node] -= 1
+            if not keep.all():
+                tree = tree.select(keep)
+                tree._paths = [
+                    path for path, kept in zip(paths, keep.tolist()) if kept
+                ]
+                return tree, old_id[keep]
+        tree._paths = paths
+        tree._node_index = dict(index)
+        tree._node_index.update(new_nodes)
+        return tree, old_id
+
+    # *** Computation ***                                               (emph)
+
+    def complete(self) -> "PathTree":
+        """Computes :py:attr:`subtree_value` (in place) and returns the tree
+        itself.
+        """
+        subtree_value = self.value.astype(float)
+        # propagate the values bottom up, one level at a time: all nodes of
+        # one level have their subtree values complete once the level below
+        # has been added.
+        for nodes in reversed(self.levels()[1:]):
+            np.add.at(subtree_value, self.parent[nodes], subtree_value[nodes])
+        self.subtree_value = subtree_value
+        return self
+
+
+class PathTreeBuilder(object):
+    """Incrementally builds a :class:`PathTree`.
+
+    Path components are interned as they are added, so that adding
+    a path only costs one dictionary lookup per component.
+    """
+
+    def __init__(self):
+        self._components = []  # type: List[str]
+        self._component_ids = {}  # type: Dict[str, int]
+        # maps (parent node, component id) to the node id
+        self._nodes = {}  # type: Dict[Tuple[int, int], int]
+        self._parent = [-1]  # type: List[int]
+        self._depth = [0]  # type: List[int]
+        self._component = [-1]  # type: List[int]
+        self._value = [0.0]  # type: List[float]
+        self._input_order = [-1]  # type: List[int]
+        self._n_inputs = 0
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def _intern(self, component: str) -> int:
+        try:
+            return self._component_ids[component]
+        except KeyError:
+            cid = len(self._components)
+            self._component_ids[component] = cid
+            self._components.append(component)
+            return cid
+
+    def node(self, components: Iterable[str]) -> int:
+        """Returns the node id of the path given by `components`, creating
+        it (and its ancestors) if necessary.
+        """
+        node = 0
+        nodes = self._nodes
+        intern = self._intern
+        for component in components:
+            child = nodes.get((node, intern(component)))
+            if child is None:
+                child = self.child(node, component)
+            node = child
+        return node
+
+    def child(self, parent: int, component: str) -> int:
+        """Returns the node id of the child `component` of the node
+        `parent`, creating it if necessary.
+        """
+        key = (parent, self._intern(component))
+        child = self._nodes.get(key)
+        if child is None:
+            child = len(self._parent)
+            self._nodes[key] = child
+            self._parent.append(parent)
+            self._depth.append(self._depth[parent] + 1)
+            self._component.append(key[1])
+            self._value.append(0.0)
+            self._input_order.append(-1)
+        return child
+
+    def add(self, components: Iterable[str], value: float) -> int:
+        """Adds `value` to the path given by `components` and returns its
+        node id. Adding the same path several times sums up the values.
+        """
+        return self.add_value(self.node(components), value)
+
+    def add_child(self, parent: int, component: str, value: float) -> int:
+        """Like :py:meth:`.add`, but for the child `component` of the
+        node `parent`.
+        """
+        return self.add_value(self.child(parent, component), value)
+
+    def add_value(self, node: int, value: float) -> int:
+        """Adds `value` to the existing node `node` and returns its id."""
+        self._value[node] += value
+        if self._input_order[node] < 0:
+            self._input_order[node] = self._n_inputs
+            self._n_inputs += 1
+        return node
+
+    def build(self) -> PathTree:
+        """Returns the :class:`PathTree` of all paths added so far."""
+        return PathTree(
+            parent=np.array(self._parent, dtype=np.int64),
+            depth=np.array(self._depth, dtype=np.int32),
+            component=np.array(self._component, dtype=np.int64),
+            value=np.array(self._value, dtype=float),
+            input_order=np.array(self._input_order, dtype=np.int64),
+            components=list(self._components),
+        )